@@ -1,8 +1,14 @@
 class BaseXNumber:
     """
     Defines a number in base X (with x between 2 and 10).
+
+    The number is stored as a list of integer digits, which works like an
+    odometer: 'increment' adds 1 in place, only touching the digits that
+    carry, so stepping through every value is O(1) amortised.
     """
 
+    __slots__ = ('digits', 'base', 'overflow', 'MINIMUM_VALUE', 'MAXIMUM_VALUE')
+
     def __init__(self, value, base, overflow=False):
         """
         Standard constructor.
@@ -15,7 +21,7 @@ class BaseXNumber:
         variable reaches the maximum value for the length of
         the passed string. For instance, on increasing '222'
         (base 3) by 1, if overflow is true, the result will be
-        '000'. Otherwise, it will be '1000'.
+        '1000'. Otherwise, it will remain '222'.
         """
 
         # Type verifications
@@ -42,13 +48,62 @@ class BaseXNumber:
         if not 1 <= base <= 10:
             raise ValueError('\'base\' must be >= 1 and <= 10.')
 
-        self.value = value
+        self.set_digits([int(digit) for digit in value], base, overflow)
+
+    def set_digits(self, digits, base, overflow):
+        """
+        Sets the state of the instance from already validated digits.
+        """
+        self.digits = digits
         self.base = base
         self.overflow = overflow
 
         if not overflow:
-            self.MINIMUM_VALUE = '0' * len(value)
-            self.MAXIMUM_VALUE = '{0}'.format(self.base-1) * len(value)
+            self.MINIMUM_VALUE = '0' * len(digits)
+            self.MAXIMUM_VALUE = '{0}'.format(self.base-1) * len(digits)
+
+    @property
+    def value(self):
+        # Digits are always lower than 10, so each one is a single character
+        return ''.join([str(digit) for digit in self.digits])
+
+    def to_integer(self):
+        """
+        Gets the number represented by the instance as a (base 10) integer.
+        """
+        number = 0
+        for digit in self.digits:
+            number = number * self.base + digit
+        return number
+
+    def increment(self):
+        """
+        Adds 1 to the number in place.
+
+        :return: False if the number was already at its maximum value (and
+        'overflow' is False, so it remains the same), True otherwise.
+        """
+        digits = self.digits
+        maximum_digit = self.base - 1
+        position = len(digits) - 1
+
+        # Every trailing digit at its maximum turns into zero and carries 1
+        while position >= 0 and digits[position] == maximum_digit:
+            digits[position] = 0
+            position -= 1
+
+        if position >= 0:
+            digits[position] += 1
+        elif self.overflow and self.base > 1:
+            # Prepend the carry
+            digits.insert(0, 1)
+        else:
+            # Every digit was at its maximum, so restore them
+            for position in range(len(digits)):
+                digits[position] = maximum_digit
+            return False
+
+        return True
 
     def __add__(self, baseXnumber):
         # Type verification to allow adding a string or number to a BaseXNumber
@@ -75,69 +130,46 @@ class BaseXNumber:
             raise AttributeError('the \'overflow\' attribute must be the same ' +
             'in both instances.')
 
-        # Transform value of instance in array of integers
-        initial_value_array = [int(digit) for digit in self.value]
-        # Transform value being added to the instance in array of integers
-        added_value_array = [int(digit) for digit in baseXnumber.value]
-
-        # If the value being added is smaller than the value of the instance
-        if len(added_value_array) < len(initial_value_array):
-            # Pad the value being added with 0s.
-            padding = [0] * (len(initial_value_array) - len(added_value_array))
-            added_value_array = padding + added_value_array
-
-        # If the initial value is smaller than the value being added
-        if len(initial_value_array) < len(added_value_array) and self.overflow:
-            # Pad the initial value with zeros.
-            # This only happens if overflow is 'True', because if it's false,
-            # the length of the original number can't change.
-            padding = [0] * (len(added_value_array) - len(initial_value_array))
-            initial_value_array = padding + initial_value_array
-
-        # Define the carry for when the result of the sum is greater than the base
-        carry = 0
-        # Create the results array by adding every position of the arrays above
-        result_value_array = [0] * len(initial_value_array)
-
-        # Iterating backwards through the array
-        for i in range(len(initial_value_array)-1, -1, -1):
-            # Sum both digits at current position and add the carry
-            result_value_array[i] = initial_value_array[i] + added_value_array[i] + carry
-            # Resets the carry because it's been used already
-            carry = 0
-
-            # The snippet below is how addition works, but we are not familiar
-            # with this representation, so an example may explain it better.
-
-            # 9 + 8 = 17, and 17 >= 10
-            if result_value_array[i] >= self.base:
-                # Carry is 1 (17 / 10 = 1, remainder 7)
-                carry = result_value_array[i] / self.base
-                # Final value for that position is 7 (the remainder)
-                result_value_array[i] %= self.base
-
-        if carry > 0:
-            if self.overflow:
-                # Prepend the array with the carry (in the example above, 1)
-                result_value_array = [carry] + result_value_array
-            else:
-                # Sets the result to the maximum value of the instance
-                result_value_array = [int(digit) for digit in self.MAXIMUM_VALUE]
-
-        # Transform digits back to strings so they can be joined
-        result_value_array = [str(digit) for digit in result_value_array]
-        result_str = ''.join(result_value_array)
+        # Adding 1 (as done by the counter of the solver) doesn't need the
+        # conversion to integer.
+        if baseXnumber.digits == [1]:
+            result = BaseXNumber.__new__(BaseXNumber)
+            result.set_digits(list(self.digits), self.base, self.overflow)
+            result.increment()
+            return result
+
+        total = self.to_integer() + baseXnumber.to_integer()
+        length = len(self.digits)
+
+        # The result only grows beyond the length of the instance if
+        # overflow is 'True'.
+        if self.overflow and self.base > 1:
+            length = max(length, len(baseXnumber.digits))
+            while total >= self.base ** length:
+                length += 1
+        elif total >= self.base ** length:
+            # Sets the result to the maximum value of the instance
+            total = self.base ** length - 1
+
+        # Convert the total back to digits of the base
+        digits = [0] * length
+        for position in range(length - 1, -1, -1):
+            total, digits[position] = divmod(total, self.base)
 
         # Creates a new instance with the final value and returns it
-        result = BaseXNumber(value=result_str, base=self.base, overflow=self.overflow)
-        return result    
+        result = BaseXNumber.__new__(BaseXNumber)
+        result.set_digits(digits, self.base, self.overflow)
+        return result
 
     def __eq__(self, other):
-        return self.value == other.value and self.base == other.base
+        return self.digits == other.digits and self.base == other.base
 
     def get_value(self):
         return self.value
 
+    def get_digits(self):
+        return self.digits
+
     def get_base(self):
         return self.base
 
@@ -145,13 +177,13 @@ class BaseXNumber:
         return self.overflow
 
     def get_minimum_value(self):
-        if self.overflow:
+        if not self.overflow:
             return self.MINIMUM_VALUE
         else:
-            raise AttributeError('instances with \'overflow\' set to \'False\' don\'t have the MINIMUM_VALUE property.')
+            raise AttributeError('instances with \'overflow\' set to \'True\' don\'t have the MINIMUM_VALUE property.')
 
     def get_maximum_value(self):
-        if self.overflow:
+        if not self.overflow:
             return self.MAXIMUM_VALUE
         else:
-            raise AttributeError('instances with \'overflow\' set to \'False\' don\'t have the MAXIMUM_VALUE property.')
+            raise AttributeError('instances with \'overflow\' set to \'True\' don\'t have the MAXIMUM_VALUE property.')
@@ -0,0 +1,212 @@
+from Checkpoint import Checkpoint
+from Level import Level
+from Solver import Solver
+
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import argparse
+import csv
+import hashlib
+import json
+import os
+import sys
+import time
+
+# Fields describing a level, in the order the Level constructor takes them
+LEVEL_FIELDS = ('index', 'moves', 'goal', 'start', 'buttons')
+
+def read_levels(source, format=None):
+    """
+    Reads level definitions one at a time, so level packs of any size can
+    be streamed without loading them into memory.
+
+    Keyword arguments:
+    source -- path of a JSONL or CSV file, or an open text file.
+    format -- (optional) either 'jsonl' or 'csv'. If not given, it is
+    guessed from the extension of the file (defaulting to 'jsonl').
+
+    Every JSONL line and every CSV row (which must have a header) holds the
+    fields index, moves, goal, start and buttons. The buttons are a string
+    separated by ', ' (comma and space), or a list of strings in JSONL.
+
+    CSV rows are yielded as dictionaries, and JSONL lines as they are read
+    (see 'parse_record'), so a malformed line only fails its own level
+    instead of the whole stream.
+    """
+    if isinstance(source, str):
+        if format is None:
+            format = 'csv' if source.lower().endswith('.csv') else 'jsonl'
+        with open(source, newline='') as file:
+            yield from read_levels(file, format)
+        return
+
+    if format == 'csv':
+        for row in csv.DictReader(source):
+            yield row
+    elif format in (None, 'jsonl'):
+        for line in source:
+            # Ignore blank lines, such as the one at the end of the file
+            if line.strip():
+                yield line
+    else:
+        raise ValueError('\'format\' must be either \'jsonl\' or \'csv\'.')
+
+def parse_record(record):
+    """
+    Gets the dictionary of a level definition read by 'read_levels',
+    parsing it if it's a JSONL line.
+    """
+    if isinstance(record, str):
+        record = json.loads(record)
+    if not isinstance(record, dict):
+        raise ValueError('level definition must be an object.')
+    return record
+
+def record_to_level(record):
+    """
+    Builds a Level from a level definition read by 'read_levels'.
+
+    Keyword arguments:
+    record -- dictionary with the fields index, moves, goal, start and
+    buttons, or a JSONL line with one. Numbers may be given as strings (as
+    they are in CSV files).
+    """
+    record = parse_record(record)
+    for field in LEVEL_FIELDS:
+        if field not in record:
+            raise ValueError('level definition is missing \'{0}\'.'.format(field))
+
+    buttons = record['buttons']
+    if isinstance(buttons, (list, tuple)):
+        buttons = ', '.join(buttons)
+
+    return Level(
+        index=int(record['index']),
+        moves=int(record['moves']),
+        goal=int(record['goal']),
+        start=int(record['start']),
+        buttons=buttons
+    )
+
+def solve_record(record, mode=Solver.DEPTH_FIRST, checkpoints=None):
+    """
+    Solves a single level definition, timing how long it takes. Defined at
+    module level so it can be sent to other processes.
+
+    Keyword arguments:
+    record -- the definition of the level (see 'record_to_level').
+    mode -- (optional) the mode passed to Solver.solve.
+    checkpoints -- (optional) directory where the progress of the solve is
+    saved (see Solver.solve_resumable), so running the batch again after
+    it was interrupted continues where it stopped.
+
+    :return: a dictionary with the index of the level, its solution (None
+    if there's none), the seconds spent solving it and, if the level
+    couldn't be solved, the error that prevented it.
+    """
+    result = {'index': None, 'solution': None, 'seconds': 0.0}
+    started = time.perf_counter()
+    try:
+        record = parse_record(record)
+        result['index'] = record.get('index')
+        level = record_to_level(record)
+        result['index'] = level.get_index()
+        if checkpoints is None:
+            result['solution'] = Solver().solve(level, mode)
+        else:
+            result['solution'] = Solver().solve_resumable(level,
+                checkpoint_path(checkpoints, level, mode), mode)
+    except Exception as error:
+        result['error'] = '{0}: {1}'.format(type(error).__name__, error)
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+def checkpoint_path(checkpoints, level, mode):
+    """
+    Gets the path of the checkpoint file of a level, named after its
+    definition so that different levels never share a file.
+    """
+    definition = json.dumps([Checkpoint.level_definition(level), mode])
+    name = hashlib.sha1(definition.encode('utf-8')).hexdigest()
+    return os.path.join(checkpoints, '{0}.json'.format(name))
+
+def solve_levels(records, workers=None, mode=Solver.DEPTH_FIRST, checkpoints=None):
+    """
+    Solves a stream of level definitions with a pool of processes, yielding
+    each result as soon as it is ready (not necessarily in the input order).
+    Only a bounded amount of levels is read ahead of the ones being solved.
+
+    Keyword arguments:
+    records -- iterable of level definitions, such as the one returned by
+    'read_levels'.
+    workers -- (optional) amount of processes. Defaults to the amount of
+    processors of the machine.
+    mode -- (optional) the mode passed to Solver.solve.
+    checkpoints -- (optional) directory where the progress of every solve
+    is saved (see 'solve_record').
+    """
+    workers = workers or os.cpu_count() or 1
+    # Keep every process busy while the results are collected
+    max_pending = workers * 2
+    records = iter(records)
+    pending = set()
+    # Marks the end of the records, which may be anything (even None)
+    end = object()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        exhausted = False
+        while pending or not exhausted:
+            # Fill the pool up to its limit
+            while not exhausted and len(pending) < max_pending:
+                record = next(records, end)
+                if record is end:
+                    exhausted = True
+                else:
+                    pending.add(executor.submit(solve_record, record, mode,
+                        checkpoints))
+
+            if pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
+
+def main(arguments=None):
+    """
+    Command line entry point. Solves every level of a file and writes one
+    JSON line per level as they are solved.
+    """
+    parser = argparse.ArgumentParser(
+        description='Solves a pack of levels of Calculator: The Game.')
+    parser.add_argument('input',
+        help='JSONL or CSV file with the levels (\'-\' for the standard input).')
+    parser.add_argument('-o', '--output', default='-',
+        help='file the results are written to (defaults to the standard output).')
+    parser.add_argument('-f', '--format', choices=('jsonl', 'csv'),
+        help='format of the input (guessed from its extension by default).')
+    parser.add_argument('-w', '--workers', type=int,
+        help='amount of processes (defaults to the amount of processors).')
+    parser.add_argument('-m', '--mode', default=Solver.DEPTH_FIRST,
+        help='search mode of the solver (defaults to \'{0}\').'.format(Solver.DEPTH_FIRST))
+    parser.add_argument('-k', '--checkpoints',
+        help='directory where the progress of the solves is saved, so an '
+        'interrupted batch resumes them (brute force, depth-first and '
+        'breadth-first modes only).')
+    arguments = parser.parse_args(arguments)
+
+    if arguments.checkpoints:
+        os.makedirs(arguments.checkpoints, exist_ok=True)
+
+    source = sys.stdin if arguments.input == '-' else arguments.input
+    output = sys.stdout if arguments.output == '-' else open(arguments.output, 'w')
+
+    try:
+        records = read_levels(source, arguments.format)
+        for result in solve_levels(records, arguments.workers, arguments.mode,
+                arguments.checkpoints):
+            output.write(json.dumps(result) + '\n')
+            output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,230 @@
+from Level import Level
+from Operation import CompiledOperation
+from Solver import Solver
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+# Levels measured by the benchmark, grouped by size: (category, index,
+# moves, goal, start, buttons). Together they use every kind of button
+# understood by Operation.get_operation.
+CORPUS = (
+    ('small', 1, 3, 8, 0, '+2, +3'),
+    ('small', 2, 3, 9, 3, 'x4, +4, -2'),
+    ('small', 3, 3, 5, 15, '<<, 5, +/-'),
+    ('small', 4, 3, 8, 100, '/2, 1=>2, /5'),
+    ('medium', 5, 5, 35, 1, 'x^2, Reverse, +3, -1'),
+    ('medium', 6, 5, 91, 12, 'SUM, <Shift, 4, x2'),
+    ('medium', 7, 5, 6886, 25, 'Shift>, Mirror, -9, <<'),
+    ('medium', 8, 5, -567, 7, '+/-, x3, 2=>5, /2'),
+    ('large', 9, 6, 414, 0, '+5, -3, x4, 1, Reverse, <<'),
+    ('large', 10, 6, 108149, 9, 'Mirror, SUM, x^2, 2=>1, +8, /3'),
+    ('large', 11, 7, -34933, 4, '<Shift, Shift>, 3, +/-, -6'),
+    # Unsolvable, so every mode has to exhaust its search
+    ('large', 12, 6, 123457, 2, '+7, x2, 9, Reverse, -4, SUM'),
+)
+
+# Modes measured when none are given
+DEFAULT_MODES = (Solver.BRUTE_FORCE, Solver.DEPTH_FIRST, Solver.BREADTH_FIRST)
+
+# Metrics compared against the baseline
+COMPARED_METRICS = ('seconds', 'states', 'peak_memory')
+
+# Times only regress when they grow by more than this amount of seconds
+# too, since the scheduler alone changes the time of a solve by a few
+# tens of milliseconds between executions.
+MINIMUM_SECONDS = 0.05
+
+def build_corpus(categories=None):
+    """
+    Builds the levels of the benchmark.
+
+    Keyword arguments:
+    categories -- (optional) iterable with the categories to include
+    ('small', 'medium' and/or 'large'). Every level is included by default.
+
+    :return: a list of tuples with the category and the instance of Level.
+    """
+    return [(category, Level(index, moves, goal, start, buttons))
+        for category, index, moves, goal, start, buttons in CORPUS
+        if categories is None or category in categories]
+
+def count_presses(level):
+    """
+    Replaces the buttons of a level by buttons that count how many times
+    they are pressed.
+
+    :param level: (Level) the level whose buttons are replaced.
+    :return: a list with a single integer, the amount of presses so far.
+    """
+    presses = [0]
+
+    def counted(function):
+        # Stateful buttons receive the whole state of the game
+        def press(*arguments):
+            presses[0] += 1
+            return function(*arguments)
+        return press
+
+    level.buttons = tuple(CompiledOperation(button.get_token(), counted(button.get_function()),
+        button.get_operation_type(), button.get_operands()) for button in level.get_buttons())
+    return presses
+
+def measure(level, mode, repeat=1):
+    """
+    Solves a level, measuring the resources used.
+
+    Keyword arguments:
+    level -- instance of Level that is going to be solved. Its buttons are
+    replaced by counting ones (see count_presses).
+    mode -- the mode passed to Solver.solve.
+    repeat -- (optional) amount of times the level is solved. The fastest
+    time is reported.
+
+    :return: a dictionary with the solution, the fastest wall time in
+    seconds, the amount of states evaluated (button presses) and the peak
+    memory allocated while solving, in bytes.
+    """
+    presses = count_presses(level)
+    seconds = None
+
+    # Time the solves without tracing memory, as tracing slows them down
+    for _ in range(repeat):
+        presses[0] = 0
+        started = time.perf_counter()
+        solution = Solver().solve(level, mode)
+        elapsed = time.perf_counter() - started
+        seconds = elapsed if seconds is None else min(seconds, elapsed)
+    states = presses[0]
+
+    tracemalloc.start()
+    try:
+        Solver().solve(level, mode)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'solution': solution,
+        'seconds': seconds,
+        'states': states,
+        'peak_memory': peak_memory
+    }
+
+def run(modes=DEFAULT_MODES, categories=None, repeat=1):
+    """
+    Measures every level of the corpus with every mode.
+
+    :return: a dictionary with information about the environment and a
+    list with one result per level and mode.
+    """
+    results = []
+    for mode in modes:
+        for category, level in build_corpus(categories):
+            result = measure(level, mode, repeat)
+            result.update({'level': level.get_index(), 'category': category, 'mode': mode})
+            results.append(result)
+
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+def compare(report, baseline, threshold=1.25):
+    """
+    Finds the measurements that got worse than in a baseline report.
+
+    Keyword arguments:
+    report -- the dictionary returned by 'run'.
+    baseline -- a dictionary returned by 'run' in a previous execution.
+    threshold -- (optional) how many times a metric may exceed its
+    baseline value before it's considered a regression. Can't be lower
+    than 1.
+
+    :return: a list of dictionaries describing each regression.
+    """
+    if threshold < 1:
+        raise ValueError('\'threshold\' can\'t be lower than 1.')
+
+    baseline_results = {(result['level'], result['mode']): result
+        for result in baseline['results']}
+    regressions = []
+
+    for result in report['results']:
+        previous = baseline_results.get((result['level'], result['mode']))
+        if previous is None:
+            continue
+
+        for metric in COMPARED_METRICS:
+            if metric == 'seconds' and \
+                    result[metric] - previous[metric] <= MINIMUM_SECONDS:
+                continue
+            if result[metric] > previous[metric] * threshold:
+                regressions.append({
+                    'level': result['level'],
+                    'mode': result['mode'],
+                    'metric': metric,
+                    'baseline': previous[metric],
+                    'current': result[metric]
+                })
+
+    return regressions
+
+def threshold(value):
+    """
+    Parses the --threshold argument, which can't be lower than 1.
+    """
+    ratio = float(value)
+    if ratio < 1:
+        raise argparse.ArgumentTypeError('must be at least 1 (got {0}).'.format(value))
+    return ratio
+
+def main(arguments=None):
+    """
+    Command line entry point. Runs the benchmark, writes its results as
+    JSON and, if a baseline is given, exits with status 1 on regressions.
+    """
+    parser = argparse.ArgumentParser(
+        description='Benchmarks the solver of Calculator: The Game.')
+    parser.add_argument('-m', '--modes', nargs='+', default=list(DEFAULT_MODES),
+        help='modes of the solver to measure.')
+    parser.add_argument('-c', '--categories', nargs='+', choices=('small', 'medium', 'large'),
+        help='categories of levels to measure (all of them by default).')
+    parser.add_argument('-r', '--repeat', type=int, default=3,
+        help='amount of times each level is solved (the fastest time is kept).')
+    parser.add_argument('-o', '--output', default='-',
+        help='file the results are written to (defaults to the standard output).')
+    parser.add_argument('-b', '--baseline',
+        help='results of a previous execution to compare against.')
+    parser.add_argument('-t', '--threshold', type=threshold, default=1.25,
+        help='ratio over the baseline considered a regression, at least 1 '
+        '(defaults to 1.25). Times must also grow by more than {0} seconds.'
+        .format(MINIMUM_SECONDS))
+    arguments = parser.parse_args(arguments)
+
+    report = run(arguments.modes, arguments.categories, arguments.repeat)
+
+    if arguments.baseline:
+        with open(arguments.baseline) as file:
+            report['regressions'] = compare(report, json.load(file), arguments.threshold)
+
+    if arguments.output == '-':
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(arguments.output, 'w') as file:
+            json.dump(report, file, indent=2)
+
+    for regression in report.get('regressions', []):
+        sys.stderr.write('regression: level {level} ({mode}) {metric} went from '
+            '{baseline} to {current}\n'.format(**regression))
+
+    return 1 if report.get('regressions') else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
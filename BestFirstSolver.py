@@ -0,0 +1,181 @@
+from Level import Level
+from Operation import Operation
+from Solver import Solver
+
+import heapq
+import math
+
+class BestFirstSolver:
+    """
+    Solves levels exploring first the values estimated to be closest to the
+    goal (A* search), instead of enumerating every sequence.
+    """
+
+    def __init__(self, admissible=True, max_frontier=100000):
+        """
+        BestFirstSolver constructor.
+
+        Keyword arguments:
+        admissible -- (optional) if True, the estimates never exceed the
+        actual amount of presses left, so the solution found is the
+        shortest. If False, the estimates are more informed (using every
+        button of the level), usually finding a solution faster but not
+        necessarily the shortest.
+        max_frontier -- (optional) maximum amount of values waiting to be
+        explored. When exceeded, the ones estimated to be farthest from the
+        goal are discarded (which may keep a solution from being found).
+        """
+
+        # Type verifications
+        if not isinstance(admissible, bool):
+            raise TypeError('\'admissible\' must be a boolean.')
+        if not isinstance(max_frontier, int):
+            raise TypeError('\'max_frontier\' must be an integer.')
+
+        # Value verifications
+        if max_frontier < 1:
+            raise ValueError('\'max_frontier\' must be a non-zero, positive integer.')
+
+        self.admissible = admissible
+        self.max_frontier = max_frontier
+        self.states_expanded = 0
+
+    def get_heuristic(self, level):
+        """
+        Builds the function estimating how many presses a value is from the
+        goal of a level.
+
+        With admissible estimates, levels where every button adds or
+        subtracts use the presses of the largest operand needed to cover
+        the distance, and every other level just uses 1 for values other
+        than the goal. Otherwise, the smallest of these estimates is used:
+        presses of the largest additive operand, presses of the largest
+        multiplier to cover the ratio between the values, and the
+        difference in digits over the most digits a button can add or
+        remove.
+
+        :return: a function that receives a value and returns the estimate.
+        """
+        goal = level.get_goal()
+        goal_digits = len(str(abs(goal)))
+
+        additive_step = 0
+        multiplier = 0
+        digit_step = 0
+        only_additive = True
+
+        for button in level.get_buttons():
+            token = button.get_token()
+            operation_type = Operation.get_operation_type(token)
+
+            if operation_type in ('+', '-'):
+                additive_step = max(additive_step, abs(int(token[1:])))
+                continue
+
+            only_additive = False
+            if operation_type == 'x':
+                multiplier = max(multiplier, abs(int(token[1:])))
+            elif operation_type == 'append':
+                digit_step = max(digit_step, len(token))
+            elif operation_type == '<<':
+                digit_step = max(digit_step, 1)
+
+        def admissible(value):
+            distance = abs(goal - value)
+            if distance == 0:
+                return 0
+            if only_additive and additive_step:
+                return math.ceil(distance / additive_step)
+            return 1
+
+        def informed(value):
+            distance = abs(goal - value)
+            if distance == 0:
+                return 0
+
+            estimates = []
+            if additive_step:
+                estimates.append(math.ceil(distance / additive_step))
+            if multiplier > 1 and value and abs(goal) > abs(value):
+                estimates.append(math.ceil(math.log(abs(goal) / abs(value), multiplier)))
+            if digit_step:
+                estimates.append(math.ceil(abs(goal_digits - len(str(abs(value)))) / digit_step))
+
+            return max(1, min(estimates)) if estimates else 1
+
+        return admissible if self.admissible else informed
+
+    def solve(self, level):
+        """
+        Solves a level, returning a sequence that uses at most 'moves'
+        presses in the same format as Solver.solve.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        # Stateful buttons make the estimates meaningless
+        if level.is_stateful():
+            return Solver().solve(level, Solver.BREADTH_FIRST)
+
+        start = level.get_start()
+        goal = level.get_goal()
+
+        # The search can't tell the start apart from reaching it again
+        if start == goal:
+            return Solver().breadth_first_search(level)
+
+        buttons = level.get_buttons()
+        moves = level.get_moves()
+        heuristic = self.get_heuristic(level)
+        self.states_expanded = 0
+
+        # Fewest presses found so far to reach each value, and the value it
+        # was reached from along with the index of the button pressed.
+        presses = {start: 0}
+        parents = {start: None}
+        # Entries are the estimated total presses, a counter that keeps the
+        # order of insertion among ties, the presses so far and the value.
+        frontier = [(heuristic(start), 0, 0, start)]
+        counter = 1
+
+        while frontier:
+            _, _, pressed, value = heapq.heappop(frontier)
+
+            # Skip entries superseded by a path with fewer presses
+            if pressed > presses.get(value, pressed):
+                continue
+
+            if value == goal:
+                sequence = []
+                while parents[value] is not None:
+                    value, index = parents[value]
+                    sequence.append(buttons[index].get_token())
+                sequence.reverse()
+                return ' => '.join(sequence)
+
+            if pressed == moves:
+                continue
+
+            self.states_expanded += 1
+            for index, button in enumerate(buttons):
+                result = Solver.normalize_value(button(value))
+                if result is None:
+                    continue
+                if pressed + 1 < presses.get(result, moves + 1):
+                    presses[result] = pressed + 1
+                    parents[result] = (value, index)
+                    heapq.heappush(frontier,
+                        (pressed + 1 + heuristic(result), counter, pressed + 1, result))
+                    counter += 1
+
+            # Keep the memory bounded, dropping the least promising values
+            if len(frontier) > self.max_frontier:
+                frontier = heapq.nsmallest(self.max_frontier // 2, frontier)
+                heapq.heapify(frontier)
+
+        return None
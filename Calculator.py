@@ -1,5 +1,6 @@
+from GameState import GameState
 from Level import Level
-from Operation import Operation
+from Operation import Operation, CompiledOperation
 
 class Calculator:
     """
@@ -22,22 +23,44 @@ class Calculator:
         self.level = level
         self.current_value = level.start if level else None
         self.previous_value = level.start if level else None
+        # State changed by stateful buttons: the operands of the buttons of
+        # the level and the stored value.
+        self.operands = level.get_operands() if level else ()
+        self.stored = None
 
     def perform_operation(self, operation):
         """
         Performs the given operation over the current value of the calculator.
 
         Keyword arguments:
-        operation -- string representing the operation.
+        operation -- CompiledOperation (such as the buttons of a Level) or
+        string representing the operation.
         """
 
         # Store current value as the previous value since the current value
         # is going to be changed in the following lines.
         self.previous_value = self.current_value
         self.current_value = int(self.current_value)
-        operation_function = Operation.get_operation(operation)
-        self.current_value = operation_function(self.current_value)
-        return
+        # Only parse the operation if it wasn't compiled beforehand
+        if not isinstance(operation, CompiledOperation):
+            operation = Operation.compile_operation(operation)
+
+        # The buttons of levels with stateful buttons depend on the state
+        if self.level and self.level.is_stateful() and operation in self.level.get_buttons():
+            state = self.get_game_state().press(self.level,
+                self.level.get_buttons().index(operation))
+        elif operation.get_operation_type() and operation.get_operation_type().stateful:
+            state = operation.get_function()(self.current_value, self.operands, self.stored)
+            state = GameState(*state) if state else None
+        else:
+            self.current_value = operation(self.current_value)
+            return
+
+        if state is None:
+            raise ValueError('\'{0}\' can\'t be pressed now.'.format(operation))
+        self.current_value = state.get_value()
+        self.operands = state.get_operands()
+        self.stored = state.get_stored()
 
     def set_level(self, level):
         """
@@ -57,8 +80,22 @@ class Calculator:
     def get_level(self):
         return self.level
 
+    def get_operands(self):
+        return self.operands
+
+    def get_stored(self):
+        return self.stored
+
     def clear(self):
         """
         An alias to the __init__ function to improve code legibility.
         """
         self.__init__(self.level)
+
+    def get_game_state(self):
+        """
+        Gets an immutable snapshot of the calculator, including the state
+        changed by stateful buttons.
+        """
+        return GameState(self.current_value, self.operands, self.stored)
+
@@ -0,0 +1,335 @@
+from Level import Level
+from Operation import Operation
+from Solver import Solver
+
+from array import array
+import argparse
+import itertools
+import mmap
+import struct
+import sys
+
+class Census:
+    """
+    Explores, for a start value and a set of buttons, every value reachable
+    with up to 'max_moves' presses, recording the fewest presses needed to
+    reach each one and how many different sequences of that many presses
+    reach it. Every goal is then answered by a single exploration, instead
+    of solving one level per goal.
+
+    Censuses are saved to a columnar binary file: a header, the button sets
+    and one contiguous column per field (start, button set, goal, moves and
+    solutions), so a column can be scanned (or memory-mapped) without
+    reading the others.
+    """
+
+    # Header of the binary file: magic, version, amount of button sets,
+    # amount of rows and length of the button sets.
+    HEADER = struct.Struct('<4sHHII')
+    MAGIC = b'CTGC'
+    VERSION = 1
+
+    # Columns of the file, with the typecode of the array storing them
+    COLUMNS = (
+        ('start', 'i'),
+        ('buttons', 'H'),
+        ('goal', 'i'),
+        ('moves', 'B'),
+        ('solutions', 'Q')
+    )
+
+    # Counts of solutions are saturated at the largest value the column holds
+    MAXIMUM_SOLUTIONS = 2 ** 64 - 1
+
+    def __init__(self, start, buttons, max_moves, arithmetic=False):
+        """
+        Census constructor. Explores every value reachable from 'start'.
+
+        Keyword arguments:
+        start -- the initial state of the calculator. Must be an integer the
+        calculator can display.
+        buttons -- a string with the buttons, separated by ', ' (comma and
+        space), just like in Level.
+        max_moves -- the maximum amount of presses explored. Must be between
+        1 and 255.
+        arithmetic -- (optional) whether the digit operations are performed
+        with integer arithmetic (see Operation.get_operation).
+        """
+
+        # Type verifications
+        if not isinstance(start, int):
+            raise TypeError('\'start\' must be an integer.')
+        if not isinstance(buttons, str):
+            raise TypeError('\'buttons\' must be a string.')
+        if not isinstance(max_moves, int):
+            raise TypeError('\'max_moves\' must be an integer.')
+
+        # Value verifications
+        if Solver.normalize_value(start) is None:
+            raise ValueError('\'start\' must be a value the calculator can display.')
+        if not 1 <= max_moves <= 255:
+            raise ValueError('\'max_moves\' must be between 1 and 255.')
+
+        compiled_buttons = []
+        for button in buttons.split(', '):
+            compiled_button = Operation.compile_operation(button, arithmetic)
+            if not compiled_button:
+                raise ValueError('\'buttons\' has an invalid button: \'{0}\'.'.format(button))
+            if compiled_button.get_operation_type().stateful:
+                raise ValueError('\'buttons\' has a stateful button: \'{0}\'.'.format(button))
+            compiled_buttons.append(compiled_button)
+
+        self.start = start
+        self.max_moves = max_moves
+        self.tokens = tuple(button.get_token() for button in compiled_buttons)
+        # Fewest presses needed to reach every value, and how many
+        # sequences of that many presses reach it.
+        self.depths = {}
+        self.counts = {}
+
+        self.explore(compiled_buttons)
+
+    @staticmethod
+    def from_level(level, max_moves=None):
+        """
+        Takes the census of the start and buttons of a level.
+
+        Keyword arguments:
+        level -- instance of Level.
+        max_moves -- (optional) the maximum amount of presses explored.
+        Defaults to the moves of the level.
+        """
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        buttons = ', '.join(button.get_token() for button in level.get_buttons())
+        return Census(level.get_start(), buttons,
+            max_moves if max_moves is not None else level.get_moves(),
+            level.get_arithmetic())
+
+    def explore(self, buttons):
+        """
+        Explores the reachable values one move at a time, adding up the
+        sequences reaching every value from the ones reaching its parents.
+        """
+        start = self.start
+        depths = {start: 0}
+        counts = {start: 1}
+        frontier = [start]
+        # Reaching the start again takes at least one press, so it is
+        # recorded apart from the empty sequence.
+        start_depth = None
+        start_count = 0
+
+        for depth in range(1, self.max_moves + 1):
+            next_frontier = []
+
+            for value in frontier:
+                count = counts[value]
+                for button in buttons:
+                    result = Solver.normalize_value(button(value))
+                    if result is None:
+                        continue
+
+                    if result == start:
+                        if start_depth is None:
+                            start_depth = depth
+                        if start_depth == depth:
+                            start_count += count
+                        continue
+
+                    result_depth = depths.get(result)
+                    if result_depth is None:
+                        depths[result] = depth
+                        counts[result] = count
+                        next_frontier.append(result)
+                    elif result_depth == depth:
+                        counts[result] += count
+
+            frontier = next_frontier
+            if not frontier:
+                break
+
+        if start_depth is None:
+            del depths[start]
+            del counts[start]
+        else:
+            depths[start] = start_depth
+            counts[start] = start_count
+
+        self.depths = depths
+        self.counts = counts
+
+    def get_start(self):
+        return self.start
+
+    def get_max_moves(self):
+        return self.max_moves
+
+    def get_buttons(self):
+        return self.tokens
+
+    def get_goals(self):
+        """
+        Gets every reachable value, in ascending order.
+        """
+        return sorted(self.depths)
+
+    def get_depth(self, goal):
+        """
+        Gets the fewest presses needed to reach a value, or None if it isn't
+        reachable within the maximum moves.
+        """
+        return self.depths.get(goal)
+
+    def get_solutions(self, goal):
+        """
+        Gets how many sequences of the fewest presses reach a value (0 if it
+        isn't reachable).
+        """
+        return self.counts.get(goal, 0)
+
+    def is_solvable(self, goal, moves):
+        """
+        Determines if a level with the start and buttons of the census can
+        be solved with at most 'moves' presses.
+        """
+        depth = self.depths.get(goal)
+        return depth is not None and depth <= moves
+
+    def rows(self):
+        """
+        Yields a tuple with every reachable value, the fewest presses needed
+        and the amount of solutions with that many presses, by value.
+        """
+        for goal in self.get_goals():
+            yield goal, self.depths[goal], self.counts[goal]
+
+    @staticmethod
+    def save(path, censuses):
+        """
+        Writes censuses to a columnar binary file.
+
+        Keyword arguments:
+        path -- path of the file.
+        censuses -- iterable of Census instances. Censuses sharing their
+        buttons share their entry in the table of button sets.
+        """
+        button_sets = {}
+        columns = {name: array(typecode) for name, typecode in Census.COLUMNS}
+
+        for census in censuses:
+            buttons = ', '.join(census.get_buttons())
+            button_set = button_sets.setdefault(buttons, len(button_sets))
+            if button_set > 0xFFFF:
+                raise ValueError('a census file can\'t have more than 65536 button sets.')
+
+            for goal, depth, count in census.rows():
+                columns['start'].append(census.get_start())
+                columns['buttons'].append(button_set)
+                columns['goal'].append(goal)
+                columns['moves'].append(depth)
+                columns['solutions'].append(min(count, Census.MAXIMUM_SOLUTIONS))
+
+        # Button sets are separated by new lines, in the order of their index
+        names = '\n'.join(button_sets).encode('utf-8')
+        rows = len(columns['goal'])
+
+        with open(path, 'wb') as file:
+            file.write(Census.HEADER.pack(Census.MAGIC, Census.VERSION,
+                len(button_sets), rows, len(names)))
+            file.write(names)
+            position = Census.HEADER.size + len(names)
+
+            for name, _ in Census.COLUMNS:
+                column = columns[name]
+                # Align every column to its item size, so it can be read
+                # straight from memory.
+                padding = -position % column.itemsize
+                file.write(b'\0' * padding)
+                # The file is always little-endian
+                if sys.byteorder == 'big':
+                    column.byteswap()
+                file.write(column.tobytes())
+                position += padding + len(column) * column.itemsize
+
+    @staticmethod
+    def load(path):
+        """
+        Reads a file written by 'save'. The file is memory-mapped, so only
+        the columns used are actually read.
+
+        Keyword arguments:
+        path -- path of the file.
+
+        :return: a dictionary with the list of button sets ('button_sets')
+        and a sequence per column, indexed by row: 'start', 'buttons' (index
+        of the button set), 'goal', 'moves' and 'solutions'.
+        """
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, button_set_count, rows, names_length = Census.HEADER.unpack_from(data)
+        if magic != Census.MAGIC or version != Census.VERSION:
+            raise ValueError('\'{0}\' is not a census file.'.format(path))
+
+        position = Census.HEADER.size
+        names = bytes(data[position:position + names_length]).decode('utf-8')
+        position += names_length
+
+        view = memoryview(data)
+        census = {'button_sets': names.split('\n') if button_set_count else []}
+        for name, typecode in Census.COLUMNS:
+            itemsize = array(typecode).itemsize
+            position += -position % itemsize
+            column = view[position:position + rows * itemsize]
+            if sys.byteorder == 'big':
+                column = array(typecode, column.tobytes())
+                column.byteswap()
+            else:
+                column = column.cast(typecode)
+            census[name] = column
+            position += rows * itemsize
+        return census
+
+    @staticmethod
+    def sweep(starts, button_sets, max_moves, arithmetic=False):
+        """
+        Takes the census of every combination of start and button set.
+
+        Keyword arguments:
+        starts -- iterable of start values.
+        button_sets -- iterable of strings with buttons, as in Level.
+        max_moves -- the maximum amount of presses explored.
+        arithmetic -- (optional) as in the constructor.
+
+        :return: a generator of Census instances.
+        """
+        for start, buttons in itertools.product(starts, list(button_sets)):
+            yield Census(start, buttons, max_moves, arithmetic)
+
+def main(arguments=None):
+    """
+    Command line entry point. Takes the census of every combination of the
+    given starts and button sets and writes them to a census file.
+    """
+    parser = argparse.ArgumentParser(
+        description='Finds every goal reachable in Calculator: The Game for '
+        'combinations of start values and buttons.')
+    parser.add_argument('output',
+        help='census file the results are written to.')
+    parser.add_argument('-s', '--start', type=int, nargs='+', required=True,
+        help='start values.')
+    parser.add_argument('-b', '--buttons', action='append', required=True,
+        help='buttons separated by \', \' (repeat for every button set).')
+    parser.add_argument('-m', '--max-moves', type=int, required=True,
+        help='maximum amount of presses explored.')
+    parser.add_argument('-a', '--arithmetic', action='store_true',
+        help='perform the digit operations with integer arithmetic.')
+    arguments = parser.parse_args(arguments)
+
+    Census.save(arguments.output, Census.sweep(arguments.start, arguments.buttons,
+        arguments.max_moves, arguments.arithmetic))
+
+if __name__ == '__main__':
+    main()
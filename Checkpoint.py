@@ -0,0 +1,164 @@
+from Level import Level
+
+from array import array
+import base64
+import json
+import os
+import sys
+import time
+import zlib
+
+class Checkpoint:
+    """
+    Periodically saves the progress of a solve to a small JSON file, so an
+    interrupted solve can be resumed (see Solver.solve_resumable). The file
+    holds the definition of the level, the mode and the state of the
+    search, and is replaced atomically, so it is never left half-written.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path, interval=60.0):
+        """
+        Checkpoint constructor.
+
+        Keyword arguments:
+        path -- path of the checkpoint file.
+        interval -- (optional) minimum amount of seconds between saves.
+        """
+
+        # Type verifications
+        if not isinstance(path, str):
+            raise TypeError('\'path\' must be a string.')
+        if not isinstance(interval, (int, float)):
+            raise TypeError('\'interval\' must be a number.')
+
+        # Value verifications
+        if interval < 0:
+            raise ValueError('\'interval\' can\'t be negative.')
+
+        self.path = path
+        self.interval = interval
+        self.level = None
+        self.mode = None
+        self.saves = 0
+        self.last_save = time.monotonic()
+
+    def get_path(self):
+        return self.path
+
+    def get_saves(self):
+        return self.saves
+
+    def start(self, level, mode):
+        """
+        Sets the level and mode whose progress is saved.
+        """
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.level = level
+        self.mode = mode
+        self.last_save = time.monotonic()
+
+    def due(self):
+        """
+        Determines if 'interval' seconds passed since the last save.
+        """
+        return time.monotonic() - self.last_save >= self.interval
+
+    def save(self, state):
+        """
+        Writes the state of the search to the file, replacing the previous
+        one.
+
+        Keyword arguments:
+        state -- dictionary with the state of the search. Must be
+        serializable to JSON.
+        """
+        data = {
+            'version': Checkpoint.VERSION,
+            'level': Checkpoint.level_definition(self.level),
+            'mode': self.mode,
+            'state': state
+        }
+
+        # Write to a temporary file and move it over the checkpoint, so a
+        # solve killed while saving still leaves the previous checkpoint.
+        temporary_path = '{0}.tmp'.format(self.path)
+        with open(temporary_path, 'w') as file:
+            json.dump(data, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_path, self.path)
+
+        self.saves += 1
+        self.last_save = time.monotonic()
+
+    def load(self):
+        """
+        Reads the checkpoint file.
+
+        :return: a tuple with the level, the mode and the state of the
+        search, or None if there's no checkpoint.
+        """
+        try:
+            with open(self.path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return None
+
+        if not isinstance(data, dict) or data.get('version') != Checkpoint.VERSION:
+            raise ValueError('\'{0}\' is not a checkpoint file.'.format(self.path))
+
+        return Level(*data['level']), data['mode'], data['state']
+
+    def remove(self):
+        """
+        Deletes the checkpoint file, if there's one.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def level_definition(level):
+        """
+        Gets the arguments that build a level again (see Level.__reduce__).
+        """
+        return list(level.__reduce__()[1])
+
+    @staticmethod
+    def encode_bytes(data):
+        """
+        Compresses bytes into a string that can be stored in the file.
+        """
+        return base64.b64encode(zlib.compress(data)).decode('ascii')
+
+    @staticmethod
+    def decode_bytes(data):
+        """
+        Reverts 'encode_bytes'.
+        """
+        return zlib.decompress(base64.b64decode(data))
+
+    @staticmethod
+    def encode_array(values):
+        """
+        Encodes an array('i'), which is always stored little-endian.
+        """
+        if sys.byteorder == 'big':
+            values = array('i', values)
+            values.byteswap()
+        return Checkpoint.encode_bytes(values.tobytes())
+
+    @staticmethod
+    def decode_array(data):
+        """
+        Reverts 'encode_array'.
+        """
+        values = array('i', Checkpoint.decode_bytes(data))
+        if sys.byteorder == 'big':
+            values.byteswap()
+        return values
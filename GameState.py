@@ -0,0 +1,84 @@
+class GameState:
+    """
+    Immutable, hashable state of a level with stateful buttons (see
+    OperationType): the value shown, the current operand of every button
+    (None for the buttons without one) and the stored value (None if
+    nothing was stored). Two states are equal only if all three are, so
+    solvers can collapse sequences reaching the same state.
+    """
+
+    __slots__ = ('value', 'operands', 'stored', 'hash')
+
+    def __init__(self, value, operands=(), stored=None):
+        """
+        GameState constructor.
+
+        Keyword arguments:
+        value -- the value shown by the calculator.
+        operands -- (optional) tuple with the operand of every button of the
+        level, by position (see Operation.get_operand).
+        stored -- (optional) the stored value.
+        """
+        object.__setattr__(self, 'value', value)
+        object.__setattr__(self, 'operands', operands)
+        object.__setattr__(self, 'stored', stored)
+        object.__setattr__(self, 'hash', hash((value, operands, stored)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError('GameState instances are immutable.')
+
+    def __eq__(self, other):
+        if isinstance(other, GameState):
+            return self.value == other.value and self.operands == other.operands \
+                and self.stored == other.stored
+        return NotImplemented
+
+    def __hash__(self):
+        return self.hash
+
+    def __repr__(self):
+        return 'GameState({0!r}, {1!r}, {2!r})'.format(self.value, self.operands,
+            self.stored)
+
+    @staticmethod
+    def from_level(level):
+        """
+        Gets the state a level starts at.
+        """
+        return GameState(level.get_start(), level.get_operands())
+
+    def press(self, level, index):
+        """
+        Presses a button of a level. Nothing is validated, so the result may
+        be a value the calculator can't display.
+
+        Keyword arguments:
+        level -- instance of Level the state belongs to.
+        index -- the index of the button.
+
+        :return: a new GameState, or None if the button can't be pressed.
+        """
+        button = level.get_button_unchecked(index)
+
+        if button.get_operation_type().stateful:
+            result = button.get_function()(int(self.value), self.operands, self.stored)
+            if result is None:
+                return None
+            return GameState(*result)
+
+        # Use the button with its current operand
+        operand = self.operands[index]
+        if operand is not None and operand != level.get_operands()[index]:
+            button = level.get_modified_button(index, operand)
+            if button is None:
+                return None
+        return GameState(button(int(self.value)), self.operands, self.stored)
+
+    def get_value(self):
+        return self.value
+
+    def get_operands(self):
+        return self.operands
+
+    def get_stored(self):
+        return self.stored
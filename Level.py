@@ -4,7 +4,7 @@ class Level:
     """
     Defines a level in Calculator: The Game.
     """
-    def __init__(self, index, moves, goal, start, buttons):
+    def __init__(self, index, moves, goal, start, buttons, arithmetic=False):
         """
         Level constructor.
 
@@ -20,6 +20,9 @@ class Level:
         buttons -- a string with the buttons available on the level,
         separated by ', ' (comma and space). This argument is further
         validated by the function '_validate_buttons()'.
+        arithmetic -- (optional) boolean determining whether the digit
+        operations of the buttons are performed with integer arithmetic
+        instead of string manipulation (see Operation.get_operation).
         """
 
         # Type verifications
@@ -33,6 +36,8 @@ class Level:
             raise TypeError('\'start\' must be an integer.')
         if not isinstance(buttons, str):
             raise TypeError('\'buttons\' must be a string.')
+        if not isinstance(arithmetic, bool):
+            raise TypeError('\'arithmetic\' must be a boolean.')
 
         # Value verifications
         if index < 1:
@@ -40,13 +45,30 @@ class Level:
         if moves < 1:
             raise ValueError('\'moves\' must be a non-zero, positive integer.')
 
-        self.validate_buttons(buttons)
+        compiled_buttons = self.validate_buttons(buttons, arithmetic)
 
         self.index = index
         self.moves = moves
         self.goal = goal
         self.start = start
-        self.buttons = buttons.split(', ')
+        self.buttons = compiled_buttons
+        self.arithmetic = arithmetic
+        # Operands of the buttons that stateful buttons (such as '[+]1')
+        # can change, by position, and whether there's any stateful button.
+        self.operands = tuple(Operation.get_operand(button.get_token())
+            for button in compiled_buttons)
+        self.stateful = any(button.get_operation_type().stateful
+            for button in compiled_buttons)
+        # Buttons compiled with a changed operand, by position and operand
+        self.modified_buttons = {}
+
+    def __reduce__(self):
+        # Compiled buttons hold functions that can't be pickled, so levels
+        # are pickled (e.g. to be sent to other processes) by their
+        # definition and compiled again when loaded.
+        buttons = ', '.join(button.get_token() for button in self.buttons)
+        return (Level, (self.index, self.moves, self.goal, self.start, buttons,
+            self.arithmetic))
 
     def get_index(self):
         return self.index
@@ -63,6 +85,32 @@ class Level:
     def get_buttons(self):
         return self.buttons
 
+    def get_arithmetic(self):
+        return self.arithmetic
+
+    def get_operands(self):
+        return self.operands
+
+    def is_stateful(self):
+        return self.stateful
+
+    def get_modified_button(self, index, operand):
+        """
+        Gets a button of the level with its operand changed (see
+        Operation.set_operand), compiling it only the first time.
+
+        :return: a CompiledOperation, or None if the button can't have the
+        operand.
+        """
+        key = (index, operand)
+        try:
+            return self.modified_buttons[key]
+        except KeyError:
+            token = Operation.set_operand(self.buttons[index].get_token(), operand)
+            button = Operation.compile_operation(token, self.arithmetic) if token else None
+            self.modified_buttons[key] = button
+            return button
+
     def get_button_at(self, index):
         if index >= len(self.buttons):
             raise ValueError('\'index\' is greater than the last ' +
@@ -72,7 +120,18 @@ class Level:
         else:
             return self.buttons[index]
 
-    def validate_buttons(self, buttons):
+    def get_button_unchecked(self, index):
+        """
+        Same as 'get_button_at', without validating the index. Meant for the
+        solver, which only uses indexes of existing buttons.
+        """
+        return self.buttons[index]
+
+    def validate_buttons(self, buttons, arithmetic=False):
+        """
+        Parses every button of the level, returning a tuple with the
+        CompiledOperation of each one, in the same order.
+        """
         # Verify if the instance already has the 'buttons' property.
         # If this is the case, the function is being called from outside
         # this class.
@@ -84,14 +143,19 @@ class Level:
         # Convert string with list of buttons to array of buttons
         buttons = buttons.split(', ')
 
+        compiled_buttons = []
+
         # Iterate through the list of buttons
         for button in buttons:
-            # Get the function representing the operation
-            operation_function = Operation.get_operation(button)
+            # Parse the operation once, so it's ready to be performed
+            compiled_button = Operation.compile_operation(button, arithmetic)
             # If the operation does not exist, raise the error
-            if not operation_function:
+            if not compiled_button:
                 raise ValueError('\'buttons\' has an invalid button: \'{0}\'.' \
                 .format(button))
+            compiled_buttons.append(compiled_button)
+
+        return tuple(compiled_buttons)
 
 class PermissionException(Exception):
     pass
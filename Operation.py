@@ -1,71 +1,611 @@
 import math
 
+# Powers of ten used by the arithmetic digit operations, so the amount of
+# digits of a value can be found without converting it to a string.
+POWERS_OF_TEN = tuple(10 ** exponent for exponent in range(19))
+
+class CompiledOperation:
+    """
+    A button that has already been parsed into the function it performs,
+    so it can be pressed any number of times without parsing it again.
+    """
+
+    __slots__ = ('token', 'function', 'operation_type', 'operands')
+
+    def __init__(self, token, function, operation_type=None, operands=None):
+        """
+        CompiledOperation constructor.
+
+        Keyword arguments:
+        token -- the string representing the operation, as shown on the button.
+        function -- the function returned by Operation.get_operation for
+        that string.
+        operation_type -- (optional) the OperationType the token was parsed
+        as, describing the operation.
+        operands -- (optional) the operands parsed from the token.
+        """
+        self.token = token
+        self.function = function
+        self.operation_type = operation_type
+        self.operands = operands
+
+    def __call__(self, value):
+        return self.function(value)
+
+    def __eq__(self, other):
+        if isinstance(other, CompiledOperation):
+            return self.token == other.token
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.token)
+
+    def __str__(self):
+        return self.token
+
+    def __repr__(self):
+        return 'CompiledOperation({0!r})'.format(self.token)
+
+    def get_token(self):
+        return self.token
+
+    def get_function(self):
+        return self.function
+
+    def get_operation_type(self):
+        return self.operation_type
+
+    def get_operands(self):
+        return self.operands
+
+
+class OperationType:
+    """
+    A type of button registered in Operation: how its tokens are written
+    and parsed, how its operation is performed and what the solver can
+    assume about it.
+    """
+
+    # Ways the tokens of a type are written
+    EXACT = 'exact'        # the token is always the same, such as 'Reverse'
+    PREFIX = 'prefix'      # an operator followed by the operand, such as '+2'
+    NUMERIC = 'numeric'    # the token is a number, such as '5'
+    INFIX = 'infix'        # two operands around a separator, such as '1=>2'
+
+    __slots__ = ('name', 'syntax', 'symbol', 'parser', 'implementation',
+        'arithmetic_implementation', 'inverse', 'no_op', 'cost', 'invertible',
+        'idempotent', 'involution', 'commutes_with', 'monotonic', 'cacheable',
+        'modifiable', 'stateful')
+
+    def __init__(self, name, syntax, implementation, symbol=None, parser=None,
+            arithmetic_implementation=None, inverse=None, no_op=None, cost=1,
+            invertible=False, idempotent=False, involution=False, commutes_with=(),
+            monotonic=False, cacheable=True, modifiable=False, stateful=False):
+        """
+        OperationType constructor.
+
+        Keyword arguments:
+        name -- the name of the type (see Operation.get_operation_type).
+        syntax -- one of OperationType.EXACT, PREFIX, NUMERIC or INFIX.
+        implementation -- function that receives the operands and returns
+        the function performing the operation over a value.
+        symbol -- (optional) the token (EXACT), operator (PREFIX) or
+        separator (INFIX) identifying the type. Defaults to the name.
+        parser -- (optional) function that receives the operand string (the
+        token without the operator for PREFIX, the token for NUMERIC and the
+        list of strings around the separator for INFIX) and returns the
+        operands, or None if they're invalid. EXACT types have no operands.
+        arithmetic_implementation -- (optional) same as 'implementation',
+        but performing the operation with integer arithmetic. May return
+        None for operands it can't handle.
+        inverse -- (optional) function that receives the operands and
+        returns the function undoing the operation (see
+        Operation.get_inverse), or None.
+        no_op -- (optional) function that receives the operands and returns
+        True if the operation never changes the value with them (such as
+        '+0').
+        cost -- (optional) relative cost of performing the operation, where
+        1 is the cost of the basic arithmetic operations.
+        invertible -- (optional) whether the operation can be undone (with
+        most operands, see 'inverse').
+        idempotent -- (optional) whether performing it twice is the same as
+        performing it once.
+        involution -- (optional) whether performing it twice restores the
+        original value.
+        commutes_with -- (optional) names of the types (possibly including
+        this one) whose order relative to this one doesn't change the
+        result.
+        monotonic -- (optional) whether the operation always preserves (or
+        always reverses) the order of the values.
+        cacheable -- (optional) whether the result only depends on the
+        value, so it can be cached.
+        modifiable -- (optional) whether its operand is an integer that
+        other buttons (such as '[+]1') can change.
+        stateful -- (optional) whether the operation changes the state of
+        the game rather than just the value. The functions of stateful
+        types receive the value, the operands of the buttons of the level
+        (see Operation.get_operand) and the stored value, and return them
+        changed, or None if the button can't be pressed.
+        """
+        self.name = name
+        self.syntax = syntax
+        self.symbol = symbol if symbol is not None else name
+        self.parser = parser
+        self.implementation = implementation
+        self.arithmetic_implementation = arithmetic_implementation
+        self.inverse = inverse
+        self.no_op = no_op
+        self.cost = cost
+        self.invertible = invertible
+        self.idempotent = idempotent
+        self.involution = involution
+        self.commutes_with = frozenset(commutes_with)
+        self.monotonic = monotonic
+        self.cacheable = cacheable
+        self.modifiable = modifiable
+        self.stateful = stateful
+
+    def __repr__(self):
+        return 'OperationType({0!r})'.format(self.name)
+
+
 class Operation:
     """
     The class that centralizes operation info.
+
+    Every type of button is an OperationType in a registry, where tokens
+    are dispatched with dictionary lookups: first by the whole token, then
+    by its first characters (longest prefix first), then as a number and
+    finally by separator.
     """
 
+    # Registered types, by name
+    types = {}
+    # Types by the way their tokens are written
+    exact_types = {}
+    prefix_types = {}
+    # Lengths of the registered prefixes, longest first
+    prefix_lengths = ()
+    numeric_type = None
+    infix_types = {}
+
+    @staticmethod
+    def register(operation_type):
+        """
+        Adds a type of button to the registry.
+
+        :param operation_type: (OperationType) the type to add.
+        """
+        if not isinstance(operation_type, OperationType):
+            raise TypeError('\'operation_type\' must be an instance of OperationType.')
+        if operation_type.name in Operation.types:
+            raise ValueError('there\'s already an operation type named \'{0}\'.'
+                .format(operation_type.name))
+
+        if operation_type.syntax == OperationType.EXACT:
+            Operation.exact_types[operation_type.symbol] = operation_type
+        elif operation_type.syntax == OperationType.PREFIX:
+            if not operation_type.symbol:
+                raise ValueError('prefixes can\'t be empty.')
+            Operation.prefix_types[operation_type.symbol] = operation_type
+            Operation.prefix_lengths = tuple(sorted(
+                set(Operation.prefix_lengths) | {len(operation_type.symbol)}, reverse=True))
+        elif operation_type.syntax == OperationType.NUMERIC:
+            Operation.numeric_type = operation_type
+        elif operation_type.syntax == OperationType.INFIX:
+            Operation.infix_types[operation_type.symbol] = operation_type
+        else:
+            raise ValueError('\'syntax\' must be one of the syntaxes defined in OperationType.')
+
+        Operation.types[operation_type.name] = operation_type
+
     @staticmethod
-    def get_operation(operation):
+    def parse(operation):
+        """
+        Finds the type of an operation and parses its operands.
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: a tuple with the OperationType and the operands, or
+        (None, None) if the operation does not exist.
+        """
+        operation_type = Operation.exact_types.get(operation)
+        if operation_type:
+            return operation_type, ()
+
+        # Longer prefixes first, so 'x^2' isn't taken for 'x'
+        for length in Operation.prefix_lengths:
+            operation_type = Operation.prefix_types.get(operation[:length])
+            if operation_type:
+                operands = operation_type.parser(operation[length:])
+                if operands is None:
+                    return None, None
+                return operation_type, operands
+
+        operation_type = Operation.numeric_type
+        if operation_type and Operation.is_numeric(operation):
+            operands = operation_type.parser(operation)
+            if operands is not None:
+                return operation_type, operands
+
+        for separator, operation_type in Operation.infix_types.items():
+            if separator in operation:
+                operands = operation_type.parser(operation.split(separator))
+                if operands is None:
+                    return None, None
+                return operation_type, operands
+
+        return None, None
+
+    @staticmethod
+    def compile_operation(operation, arithmetic=False):
+        """
+        Parses an operation once, so it can be performed repeatedly.
+
+        :param operation: (string) the operation, as shown on the button.
+        :param arithmetic: (boolean) whether to use the arithmetic
+        implementation of the digit operations (see get_operation).
+        :return: a CompiledOperation, or None if the operation does not exist.
+        """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None:
+            return None
+        operation_function = Operation.build(operation_type, operands, arithmetic)
+        return CompiledOperation(operation, operation_function, operation_type, operands)
+
+    @staticmethod
+    def build(operation_type, operands, arithmetic=False):
+        """
+        Gets the function performing an operation of a type with particular
+        operands.
+        """
+        if arithmetic and operation_type.arithmetic_implementation:
+            operation_function = operation_type.arithmetic_implementation(operands)
+            if operation_function:
+                return operation_function
+        return operation_type.implementation(operands)
+
+    @staticmethod
+    def get_operation_type(operation):
+        """
+        Gets the type of an operation, which groups buttons that perform the
+        same operation with different operands (such as '+2' and '+3').
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: a string naming the type: the operator for basic operations
+        ('+', '-', 'x', '/', 'x^'), 'append' for numbers, '=>' for
+        replacements and the operation itself for the remaining ones.
+        """
+        operation_type, _ = Operation.parse(operation)
+        return operation_type.name if operation_type else operation
+
+    @staticmethod
+    def is_stateful(operation):
+        """
+        Determines if an operation changes the state of the game rather than
+        just the value (see OperationType).
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: a boolean.
+        """
+        operation_type, _ = Operation.parse(operation)
+        return operation_type is not None and operation_type.stateful
+
+    @staticmethod
+    def get_operand(operation):
+        """
+        Gets the operand of an operation that other buttons can change, such
+        as 2 for '+2' or 5 for '5'.
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: an integer, or None if the operation has no such operand.
+        """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None or not operation_type.modifiable:
+            return None
+        return int(operands)
+
+    @staticmethod
+    def set_operand(operation, operand):
+        """
+        Changes the operand of an operation (see 'get_operand').
+
+        :param operation: (string) the operation, as shown on the button.
+        :param operand: (int) the new operand.
+        :return: the string representing the changed operation, or None if
+        the operation can't have that operand.
+        """
+        operation_type, _ = Operation.parse(operation)
+        if operation_type is None or not operation_type.modifiable:
+            return None
+        # Dividing by zero can't be pressed
+        if operation_type.name == '/' and operand == 0:
+            return None
+        if operation_type.syntax == OperationType.PREFIX:
+            changed = operation_type.symbol + str(operand)
+        else:
+            changed = str(operand)
+        # Negative numbers would be taken for subtractions, for instance
+        changed_type, _ = Operation.parse(changed)
+        return changed if changed_type is operation_type else None
+
+    @staticmethod
+    def get_type(name):
+        """
+        Gets a registered OperationType by its name, or None.
+        """
+        return Operation.types.get(name)
+
+    @staticmethod
+    def is_no_op(operation):
+        """
+        Determines if an operation never changes the value, such as '+0'.
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: a boolean.
+        """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None or not operation_type.no_op:
+            return False
+        return operation_type.no_op(operands)
+
+    @staticmethod
+    def commute(first, second):
+        """
+        Determines if the order of two types of operations doesn't change
+        the result.
+
+        :param first: (string) the name of a type.
+        :param second: (string) the name of another (or the same) type.
+        :return: a boolean.
+        """
+        first_type = Operation.types.get(first)
+        second_type = Operation.types.get(second)
+        if not first_type or not second_type:
+            return False
+        return second in first_type.commutes_with or first in second_type.commutes_with
+
+    @staticmethod
+    def get_operation(operation, arithmetic=False):
         """
         Gets the function representing an operation.
 
         :param operation: (string) the operation the user wants the function for.
+        :param arithmetic: (boolean) if True, the digit operations are
+        performed with integer arithmetic instead of string manipulation.
+        Both implementations give the same results.
         :return: the lambda function for the operation.
         """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None:
+            return None
+        return Operation.build(operation_type, operands, arithmetic)
 
-        def is_numeric(value):
-            """
-            Determines if a string is an integer number.
+    @staticmethod
+    def get_arithmetic_operation(operation):
+        """
+        Gets the function representing a digit operation, implemented with
+        integer arithmetic (divmod and powers of ten) rather than converting
+        the value to a string and back.
 
-            :param value: (string) the value to test.
-            :return: a boolean informing if it was possible to parse the string.
+        :param operation: (string) the operation the user wants the function for.
+        :return: the function for the operation, or None if the operation
+        has no arithmetic implementation.
+        """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None or not operation_type.arithmetic_implementation:
+            return None
+        return operation_type.arithmetic_implementation(operands)
+
+    @staticmethod
+    def get_inverse(operation):
+        """
+        Gets the function that undoes an operation, used to search backwards
+        from the goal of a level.
+
+        :param operation: (string) the operation the user wants the inverse of.
+        :return: a function that receives a value and returns a list with
+        the candidate values that may produce it when the operation is
+        performed (callers must confirm each candidate by performing the
+        operation), or None if the operation can't be undone.
+        """
+        operation_type, operands = Operation.parse(operation)
+        if operation_type is None or not operation_type.inverse:
+            return None
+        return operation_type.inverse(operands)
+
+    @staticmethod
+    def is_numeric(value):
+        """
+        Determines if a string is an integer number.
+
+        :param value: (string) the value to test.
+        :return: a boolean informing if it was possible to parse the string.
+        """
+        try:
+            value = int(value)
+            return True
+        except:
+            return False
+
+    @staticmethod
+    def get_sign(value):
+        """
+        Gets the sign of a number.
+
+        :param value: (int) the value to extract the sign of.
+        :return: a string, either '-' if value < 0, '' otherwise.
+        """
+        return '-' if value < 0 else ''
+
+    @staticmethod
+    def power_of_ten(exponent):
+        """
+        Gets 10 to the power of 'exponent', using the precomputed table
+        whenever possible.
+        """
+        if exponent < len(POWERS_OF_TEN):
+            return POWERS_OF_TEN[exponent]
+        return 10 ** exponent
+
+    @staticmethod
+    def count_digits(value):
+        """
+        Counts the digits of a non-negative integer.
+
+        :param value: (int) the value to count the digits of.
+        :return: the amount of digits (1 for zero).
+        """
+        digits = 1
+        while digits < len(POWERS_OF_TEN) and value >= POWERS_OF_TEN[digits]:
+            digits += 1
+        # Fall back to the string length for values beyond the table
+        if digits == len(POWERS_OF_TEN):
+            return len(str(value))
+        return digits
+
+    @staticmethod
+    def reverse_digits(value):
+        """
+        Reverses the digits of a non-negative integer.
+
+        :param value: (int) the value to reverse.
+        :return: the reversed value, without leading zeroes.
+        """
+        reversed_value = 0
+        while value:
+            value, digit = divmod(value, 10)
+            reversed_value = reversed_value * 10 + digit
+        return reversed_value
+
+    @staticmethod
+    def to_digits(value):
+        """
+        Splits a non-negative integer into its digits.
+
+        :param value: (int) the value to split.
+        :return: a list with the digits, most significant first.
+        """
+        digits = []
+        while True:
+            value, digit = divmod(value, 10)
+            digits.append(digit)
+            if not value:
+                break
+        digits.reverse()
+        return digits
+
+    @staticmethod
+    def from_digits(digits):
+        """
+        Joins a list of digits, most significant first, into an integer.
+        """
+        value = 0
+        for digit in digits:
+            value = value * 10 + digit
+        return value
+
+    @staticmethod
+    def register_defaults():
+        """
+        Registers the buttons of the game.
+        """
+        get_sign = Operation.get_sign
+        is_numeric = Operation.is_numeric
+        power_of_ten = Operation.power_of_ten
+        count_digits = Operation.count_digits
+        reverse_digits = Operation.reverse_digits
+
+        def parse_numeric(operand):
+            return operand if is_numeric(operand) else None
+
+        def parse_integer(operand):
+            return int(operand) if is_numeric(operand) else None
+
+        def rotations(value, rotate):
             """
-            try:
-                value = int(value)
-                return True
-            except:
-                return False
-        
-        def get_sign(value):
+            Gets the candidates for undoing a shift. The value may have lost
+            leading zeroes after the shift, so every length up to the
+            maximum the calculator displays is tried.
             """
-            Gets the sign of a number.
+            sign = -1 if value < 0 else 1
+            str_value = str(abs(value))
+            candidates = []
+            for length in range(len(str_value), 7):
+                padded = str_value.zfill(length)
+                candidates.append(sign * int(rotate(padded)))
+            return candidates
 
-            :param value: (int) the value to extract the sign of.
-            :return: a string, either '-' if value < 0, '' otherwise.
-            """
-            return '-' if value < 0 else ''
+        # Types that only change the digits of the value, keeping its sign,
+        # so flipping the sign before or after them is the same. Appending
+        # and replacing are left out, as they turn 0 into a positive value.
+        sign_preserving = ('<<', 'Reverse', 'SUM', '<Shift', 'Shift>', 'Mirror')
+
+        # Power
+        def power(operand):
+            return lambda value: int(math.pow(float(value), float(operand)))
 
-        # Square
-        if operation.startswith('x^'):
-            # Remove the 'x^' from the string
-            operand = operation[2:]
-            if is_numeric(operand):
-                return lambda value: int(math.pow(float(value), float(operand)))
+        def arithmetic_power(operand):
+            # Negative exponents produce fractions, which are left to the
+            # floating point implementation.
+            if operand.isdigit():
+                exponent = int(operand)
+                return lambda value: value ** exponent
+            return None
+
+        Operation.register(OperationType('x^', OperationType.PREFIX, power,
+            parser=parse_numeric, arithmetic_implementation=arithmetic_power,
+            no_op=lambda operand: int(operand) == 1, cost=2))
 
         # Flip the sign
-        elif operation == '+/-':
-            return lambda value: int(value*-1)
+        Operation.register(OperationType('+/-', OperationType.EXACT,
+            lambda operands: lambda value: int(value*-1),
+            inverse=lambda operands: lambda value: [-value],
+            invertible=True, involution=True, monotonic=True,
+            commutes_with=('x', '/', '+/-') + sign_preserving))
 
         # Basic operations
-        elif operation.startswith(('+', '-', 'x', '/')):
-            # Strip the operator from the operation string
-            operator = operation[0]
-            operand = operation[1:]
-            if is_numeric(operand):
-                # If the operand is a numeric string, parse it as an integer
-                # and returns the function that represents the operation.
-                operand = int(operand)
-                operations = {
-                    '+': lambda value: value + operand,
-                    '-': lambda value: value - operand,
-                    'x': lambda value: value * operand,
-                    '/': lambda value: float(value) / operand
-                }
-                return operations[operator]
+        def add(operand):
+            return lambda value: value + operand
+
+        def subtract(operand):
+            return lambda value: value - operand
+
+        def multiply(operand):
+            return lambda value: value * operand
+
+        def divide(operand):
+            return lambda value: float(value) / operand
+
+        def unmultiply(operand):
+            # Multiplying by zero can't be undone
+            if operand == 0:
+                return None
+            return lambda value: [value // operand] if value % operand == 0 else []
+
+        def undivide(operand):
+            if operand == 0:
+                return None
+            return lambda value: [value * operand]
+
+        Operation.register(OperationType('+', OperationType.PREFIX, add,
+            parser=parse_integer, inverse=lambda operand: lambda value: [value - operand],
+            no_op=lambda operand: operand == 0, invertible=True, monotonic=True,
+            commutes_with=('+', '-'), modifiable=True))
+        Operation.register(OperationType('-', OperationType.PREFIX, subtract,
+            parser=parse_integer, inverse=lambda operand: lambda value: [value + operand],
+            no_op=lambda operand: operand == 0, invertible=True, monotonic=True,
+            commutes_with=('+', '-'), modifiable=True))
+        Operation.register(OperationType('x', OperationType.PREFIX, multiply,
+            parser=parse_integer, inverse=unmultiply,
+            no_op=lambda operand: operand == 1, invertible=True, monotonic=True,
+            commutes_with=('x', '/', '+/-'), modifiable=True))
+        Operation.register(OperationType('/', OperationType.PREFIX, divide,
+            parser=parse_integer, inverse=undivide,
+            no_op=lambda operand: operand == 1, invertible=True, monotonic=True,
+            commutes_with=('x', '/', '+/-'), modifiable=True))
 
         # Delete the last character
-        elif operation == '<<':
+        def delete(operands):
             # Define the function separately as it would be too illegible if
             # declared directly within the lambda call.
             def substr(value):
@@ -80,28 +620,117 @@ class Operation:
 
             return lambda value: substr(value)
 
+        def arithmetic_delete(operands):
+            def substr(value):
+                # Dividing by 10 drops the last digit, which only needs to
+                # be done over the absolute value to keep the sign.
+                if value <= -10:
+                    return -(-value // 10)
+                elif value >= 10:
+                    return value // 10
+                else:
+                    return 0
+
+            return substr
+
+        Operation.register(OperationType('<<', OperationType.EXACT, delete,
+            arithmetic_implementation=arithmetic_delete, cost=2))
+
         # Append number to the end
-        elif is_numeric(operation):
+        def append(operand):
             # Add the number to the end of the value and convert it to int
-            return lambda value: int(str(value) + operation)
+            return lambda value: int(str(value) + operand)
+
+        def arithmetic_append(operand):
+            if not operand.isdigit():
+                return None
+
+            # Shift the value to the left to make room for the new digits
+            shift = power_of_ten(len(operand))
+            appended = int(operand)
+
+            def append(value):
+                if value < 0:
+                    return -(-value * shift + appended)
+                return value * shift + appended
+
+            return append
+
+        Operation.register(OperationType('append', OperationType.NUMERIC, append,
+            parser=parse_numeric, arithmetic_implementation=arithmetic_append, cost=2,
+            modifiable=True))
 
         # Replace
-        elif '=>' in operation:
-            # Fetch operands at both sides of the arrow
-            operands = operation.split('=>')
-            # If there's more than one arrow
-            if len(operands) > 2:
+        def parse_replace(operands):
+            # If there's more than one arrow, or if any operand isn't numeric
+            if len(operands) != 2 or not is_numeric(operands[0]) or \
+                    not is_numeric(operands[1]):
+                return None
+            return tuple(operands)
+
+        def replace(operands):
+            # Replace the one on the left with the one on the right
+            to_replace, replacer = operands
+            return lambda value: int(str(value).replace(to_replace, replacer))
+
+        def arithmetic_replace(operands):
+            # Signed operands are left to the string implementation
+            if not operands[0].isdigit() or not operands[1].isdigit():
                 return None
-            # If both operands are numeric
-            if is_numeric(operands[0]) and is_numeric(operands[1]):
-                # Replace the one on the left
-                to_replace = operands[0]
-                # With the one on the right
-                replacer = operands[1]
-                return lambda value: int(str(value).replace(to_replace, replacer))
+
+            to_replace = [int(digit) for digit in operands[0]]
+            replacer = [int(digit) for digit in operands[1]]
+            length = len(to_replace)
+
+            # Replacing a single digit (the usual case in the game) is
+            # done one digit at a time, from the least significant one.
+            if length == 1:
+                replaced_digit = to_replace[0]
+                replacer_value = int(operands[1])
+                replacer_shift = power_of_ten(len(replacer))
+
+                def replace_digit(value):
+                    remaining = abs(value)
+                    result = 0
+                    place = 1
+                    while True:
+                        remaining, digit = divmod(remaining, 10)
+                        if digit == replaced_digit:
+                            result += replacer_value * place
+                            place *= replacer_shift
+                        else:
+                            result += digit * place
+                            place *= 10
+                        if not remaining:
+                            break
+                    return -result if value < 0 else result
+
+                return replace_digit
+
+            def replace(value):
+                digits = Operation.to_digits(abs(value))
+                replaced = []
+                position = 0
+                # Replace every non-overlapping occurrence, from left
+                # to right, just like str.replace.
+                while position < len(digits):
+                    if digits[position:position + length] == to_replace:
+                        replaced.extend(replacer)
+                        position += length
+                    else:
+                        replaced.append(digits[position])
+                        position += 1
+                result = Operation.from_digits(replaced)
+                return -result if value < 0 else result
+
+            return replace
+
+        Operation.register(OperationType('=>', OperationType.INFIX, replace,
+            parser=parse_replace, arithmetic_implementation=arithmetic_replace,
+            no_op=lambda operands: operands[0] == operands[1], cost=2))
 
         # Reverse
-        elif operation == 'Reverse':
+        def reverse(operands):
             def reverse(value):
                 # If the value is negative, there's a minus sign that would
                 # be at the end of the string after it was reversed.
@@ -116,8 +745,38 @@ class Operation:
 
             return reverse
 
+        def arithmetic_reverse(operands):
+            def reverse(value):
+                if value < 0:
+                    return -reverse_digits(-value)
+                return reverse_digits(value)
+
+            return reverse
+
+        def unreverse(operands):
+            def unreverse(value):
+                # Reversing never produces trailing zeroes (other than 0)
+                if value == 0:
+                    return [0]
+                if value % 10 == 0:
+                    return []
+                # The reversed value may have had trailing zeroes
+                sign = -1 if value < 0 else 1
+                candidate = int(str(abs(value))[::-1])
+                candidates = []
+                while candidate <= 999999:
+                    candidates.append(sign * candidate)
+                    candidate *= 10
+                return candidates
+
+            return unreverse
+
+        Operation.register(OperationType('Reverse', OperationType.EXACT, reverse,
+            arithmetic_implementation=arithmetic_reverse, inverse=unreverse,
+            cost=2, invertible=True))
+
         # Sum
-        elif operation == 'SUM':
+        def digit_sum(operands):
             def sum(value):
                 # Start the sum at 0
                 sum = 0
@@ -135,9 +794,23 @@ class Operation:
                 return int(sign + str(sum))
 
             return sum
-        
+
+        def arithmetic_digit_sum(operands):
+            def sum(value):
+                absolute_value = abs(value)
+                sum = 0
+                while absolute_value:
+                    absolute_value, digit = divmod(absolute_value, 10)
+                    sum += digit
+                return -sum if value < 0 else sum
+
+            return sum
+
+        Operation.register(OperationType('SUM', OperationType.EXACT, digit_sum,
+            arithmetic_implementation=arithmetic_digit_sum, cost=2))
+
         # Shift left
-        elif operation == '<Shift':
+        def shift_left(operands):
             def shift_left(value):
                 # Get the sign of the number if it's negative
                 sign = get_sign(value)
@@ -154,17 +827,34 @@ class Operation:
                 final_value = remaining + shifted
                 # Prepend the sign to the value
                 return int(sign + final_value)
-            
+
+            return shift_left
+
+        def arithmetic_shift_left(operands):
+            def shift_left(value):
+                absolute_value = abs(value)
+                # Split the first digit from the remaining ones
+                first, remaining = divmod(absolute_value,
+                    power_of_ten(count_digits(absolute_value) - 1))
+                result = remaining * 10 + first
+                return -result if value < 0 else result
+
             return shift_left
 
+        Operation.register(OperationType('<Shift', OperationType.EXACT, shift_left,
+            arithmetic_implementation=arithmetic_shift_left,
+            inverse=lambda operands: lambda value: rotations(value,
+                lambda digits: digits[-1] + digits[:-1]),
+            cost=2, invertible=True))
+
         # Shift right
-        elif operation == 'Shift>':
+        def shift_right(operands):
             def shift_right(value):
                 # Get the sign of the number if it's negative
                 sign = get_sign(value)
                 # Remove the sign so we are sure that regardless of the shifts,
                 # the final result certainly will be a parseable string.
-                value = abs(value)                
+                value = abs(value)
                 # Store string conversion to prevent function calls further down
                 str_value = str(value)
                 # Create a substring of str_value without the last character
@@ -178,19 +868,90 @@ class Operation:
 
             return shift_right
 
+        def arithmetic_shift_right(operands):
+            def shift_right(value):
+                absolute_value = abs(value)
+                # Split the last digit from the remaining ones
+                remaining, last = divmod(absolute_value, 10)
+                result = last * power_of_ten(count_digits(absolute_value) - 1) + remaining
+                return -result if value < 0 else result
+
+            return shift_right
+
+        Operation.register(OperationType('Shift>', OperationType.EXACT, shift_right,
+            arithmetic_implementation=arithmetic_shift_right,
+            inverse=lambda operands: lambda value: rotations(value,
+                lambda digits: digits[1:] + digits[0]),
+            cost=2, invertible=True))
+
         # Mirror
-        elif operation == 'Mirror':
+        def mirror(operands):
             def mirror(value):
                 # Get the sign of the number if it's negative
                 sign = get_sign(value)
                 # Remove the sign so we are sure that regardless of the mirroring,
                 # the final result certainly will be a parseable string.
-                value = abs(value)                
+                value = abs(value)
                 # Store string conversion to prevent function calls further down
                 str_value = str(value)
                 # Appends the reversed string to the string itself and add the sign
                 return int(sign + str_value + str_value[::-1])
 
             return mirror
-            
-        return None
+
+        def arithmetic_mirror(operands):
+            def mirror(value):
+                absolute_value = abs(value)
+                # Reverse the value and count its digits in a single pass
+                remaining = absolute_value
+                reversed_value = 0
+                digits = 0
+                while remaining:
+                    remaining, digit = divmod(remaining, 10)
+                    reversed_value = reversed_value * 10 + digit
+                    digits += 1
+                result = absolute_value * power_of_ten(digits) + reversed_value
+                return -result if value < 0 else result
+
+            return mirror
+
+        Operation.register(OperationType('Mirror', OperationType.EXACT, mirror,
+            arithmetic_implementation=arithmetic_mirror, cost=2))
+
+        # Add to the operands of every other button
+        def parse_modifier(operand):
+            return int(operand) if operand.isdigit() else None
+
+        def modify(amount):
+            def modify(value, operands, stored):
+                return value, tuple(operand + amount if operand is not None else None
+                    for operand in operands), stored
+
+            return modify
+
+        Operation.register(OperationType('[+]', OperationType.PREFIX, modify,
+            parser=parse_modifier, no_op=lambda amount: amount == 0, cacheable=False,
+            stateful=True))
+
+        # Store the value, so it can be appended later
+        def store(operands):
+            return lambda value, operands, stored: (value, operands, value)
+
+        Operation.register(OperationType('Store', OperationType.EXACT, store,
+            idempotent=True, cacheable=False, stateful=True))
+
+        # Append the stored value
+        def recall(operands):
+            def recall(value, operands, stored):
+                # Nothing was stored yet, or the minus sign can't be appended
+                if stored is None or stored < 0:
+                    return None
+                return int(str(value) + str(stored)), operands, stored
+
+            return recall
+
+        Operation.register(OperationType('Recall', OperationType.EXACT, recall,
+            cacheable=False, stateful=True))
+
+
+Operation.register_defaults()
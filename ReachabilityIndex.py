@@ -0,0 +1,313 @@
+from Level import Level
+from Operation import Operation
+from Solver import Solver
+
+from array import array
+import mmap
+import struct
+import sys
+
+class ReachabilityIndex:
+    """
+    Records, for a start value and a set of buttons, the fewest presses
+    needed to reach every value the calculator can display and the press
+    that reached it. Built once, it answers the solution of any goal (and
+    any amount of moves) by following the recorded presses back to the
+    start. The index can be saved to a compact binary file and loaded back
+    (memory-mapped) by other processes.
+    """
+
+    # Depth of the values that weren't reached
+    UNREACHED = 255
+
+    # Amount of values the calculator can display
+    SIZE = Solver.MAXIMUM_VALUE - Solver.MINIMUM_VALUE + 1
+
+    # Header of the binary file: magic, version, amount of buttons, start,
+    # maximum moves, length of the buttons and the shortest return to the
+    # start (its depth, the offset it was reached from and the button).
+    HEADER = struct.Struct('<4sHHiiIiiH')
+    MAGIC = b'CTGR'
+    VERSION = 2
+
+    def __init__(self, start, buttons, max_moves):
+        """
+        ReachabilityIndex constructor. Explores every value reachable from
+        'start' with up to 'max_moves' presses.
+
+        Keyword arguments:
+        start -- the initial state of the calculator. Must be an integer the
+        calculator can display.
+        buttons -- a string with the buttons, separated by ', ' (comma and
+        space), just like in Level.
+        max_moves -- the maximum amount of presses explored. Must be between
+        1 and 254.
+        """
+
+        # Type verifications
+        if not isinstance(start, int):
+            raise TypeError('\'start\' must be an integer.')
+        if not isinstance(buttons, str):
+            raise TypeError('\'buttons\' must be a string.')
+        if not isinstance(max_moves, int):
+            raise TypeError('\'max_moves\' must be an integer.')
+
+        # Value verifications
+        if Solver.normalize_value(start) is None:
+            raise ValueError('\'start\' must be a value the calculator can display.')
+        if not 1 <= max_moves < ReachabilityIndex.UNREACHED:
+            raise ValueError('\'max_moves\' must be between 1 and {0}.'
+                .format(ReachabilityIndex.UNREACHED - 1))
+
+        compiled_buttons = []
+        for button in buttons.split(', '):
+            compiled_button = Operation.compile_operation(button)
+            if not compiled_button:
+                raise ValueError('\'buttons\' has an invalid button: \'{0}\'.'.format(button))
+            if compiled_button.get_operation_type().stateful:
+                raise ValueError('\'buttons\' has a stateful button: \'{0}\'.'.format(button))
+            compiled_buttons.append(compiled_button)
+
+        self.start = start
+        self.max_moves = max_moves
+        self.tokens = tuple(button.get_token() for button in compiled_buttons)
+        # For every value (by its offset from Solver.MINIMUM_VALUE), the
+        # offset of the value it was reached from, the fewest presses
+        # needed and the index of the button pressed.
+        self.parents = array('i', [-1]) * ReachabilityIndex.SIZE
+        self.depths = bytearray([ReachabilityIndex.UNREACHED]) * ReachabilityIndex.SIZE
+        self.pressed = bytearray(ReachabilityIndex.SIZE)
+        # Reaching the start again takes at least one press, so the
+        # shortest return to it is recorded apart from its depth of 0.
+        self.return_depth = ReachabilityIndex.UNREACHED
+        self.return_parent = -1
+        self.return_pressed = 0
+
+        self.build(compiled_buttons)
+
+    @staticmethod
+    def from_level(level, max_moves=None):
+        """
+        Builds the index for the start and buttons of a level.
+
+        Keyword arguments:
+        level -- instance of Level.
+        max_moves -- (optional) the maximum amount of presses explored.
+        Defaults to the moves of the level.
+        """
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        buttons = ', '.join(button.get_token() for button in level.get_buttons())
+        return ReachabilityIndex(level.get_start(), buttons,
+            max_moves if max_moves is not None else level.get_moves())
+
+    def build(self, buttons):
+        """
+        Explores the reachable values one move at a time.
+        """
+        parents = self.parents
+        depths = self.depths
+        pressed = self.pressed
+        minimum = Solver.MINIMUM_VALUE
+
+        start = self.start - minimum
+        depths[start] = 0
+        frontier = array('i', [start])
+
+        for depth in range(1, self.max_moves + 1):
+            next_frontier = array('i')
+
+            for offset in frontier:
+                value = offset + minimum
+                for index, button in enumerate(buttons):
+                    result = Solver.normalize_value(button(value))
+                    if result is None:
+                        continue
+
+                    result -= minimum
+                    if result == start:
+                        if self.return_depth == ReachabilityIndex.UNREACHED:
+                            self.return_depth = depth
+                            self.return_parent = offset
+                            self.return_pressed = index
+                    elif depths[result] == ReachabilityIndex.UNREACHED:
+                        depths[result] = depth
+                        parents[result] = offset
+                        pressed[result] = index
+                        next_frontier.append(result)
+
+            frontier = next_frontier
+            if not frontier:
+                break
+
+    def get_start(self):
+        return self.start
+
+    def get_max_moves(self):
+        return self.max_moves
+
+    def get_buttons(self):
+        return self.tokens
+
+    def get_depth(self, goal):
+        """
+        Gets the fewest presses needed to reach a value.
+
+        :param goal: (int) the value.
+        :return: the amount of presses, or None if the value isn't reachable
+        within the maximum moves of the index.
+        """
+        if Solver.normalize_value(goal) is None:
+            return None
+        depth = self.depths[goal - Solver.MINIMUM_VALUE]
+        return None if depth == ReachabilityIndex.UNREACHED else depth
+
+    def get_path(self, goal, moves=None):
+        """
+        Gets the shortest sequence of buttons that reaches a value.
+
+        Keyword arguments:
+        goal -- the value to reach.
+        moves -- (optional) the maximum amount of presses allowed.
+
+        :return: a tuple with the buttons, or None if the value can't be
+        reached with the allowed presses.
+        """
+        depth = self.get_depth(goal)
+        if depth is None or (moves is not None and depth > moves):
+            return None
+
+        return self.follow(goal - Solver.MINIMUM_VALUE, depth)
+
+    def get_return_path(self, moves=None):
+        """
+        Gets the shortest non-empty sequence of buttons that reaches the
+        start again.
+
+        Keyword arguments:
+        moves -- (optional) the maximum amount of presses allowed.
+
+        :return: a tuple with the buttons, or None if the start can't be
+        reached again with the allowed presses.
+        """
+        depth = self.return_depth
+        if depth == ReachabilityIndex.UNREACHED or (moves is not None and depth > moves):
+            return None
+
+        return self.follow(self.return_parent, depth - 1) + \
+            (self.tokens[self.return_pressed],)
+
+    def follow(self, offset, depth):
+        """
+        Follows the recorded presses from a value (by its offset) back to
+        the start.
+        """
+        sequence = []
+        for _ in range(depth):
+            sequence.append(self.tokens[self.pressed[offset]])
+            offset = self.parents[offset]
+        sequence.reverse()
+        return tuple(sequence)
+
+    def solve(self, level):
+        """
+        Solves a level with the same start and buttons as the index, giving
+        the same kind of solution as Solver.BREADTH_FIRST.
+
+        Keyword arguments:
+        level -- instance of Level. Its moves can't exceed the maximum
+        moves of the index.
+        """
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        tokens = tuple(button.get_token() for button in level.get_buttons())
+        if level.get_start() != self.start or tokens != self.tokens:
+            raise ValueError('\'level\' must have the same start and buttons as the index.')
+        if level.get_moves() > self.max_moves:
+            raise ValueError('\'level\' has more moves than the index explored.')
+
+        if level.get_goal() == self.start:
+            path = self.get_return_path(level.get_moves())
+        else:
+            path = self.get_path(level.get_goal(), level.get_moves())
+        return ' => '.join(path) if path else None
+
+    def save(self, path):
+        """
+        Writes the index to a binary file.
+
+        Keyword arguments:
+        path -- path of the file.
+        """
+        tokens = '\n'.join(self.tokens).encode('utf-8')
+        header = ReachabilityIndex.HEADER.pack(ReachabilityIndex.MAGIC,
+            ReachabilityIndex.VERSION, len(self.tokens), self.start, self.max_moves,
+            len(tokens), self.return_depth, self.return_parent, self.return_pressed)
+
+        parents = self.parents
+        # The file is always little-endian
+        if sys.byteorder == 'big':
+            parents = array('i', parents)
+            parents.byteswap()
+
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(tokens)
+            # Align the parents, so they can be read straight from memory
+            file.write(b'\0' * ReachabilityIndex.padding(len(header) + len(tokens)))
+            file.write(parents.tobytes())
+            file.write(self.depths)
+            file.write(self.pressed)
+
+    @staticmethod
+    def load(path):
+        """
+        Reads an index written by 'save'. The file is memory-mapped, so
+        only the parts used by the queries are actually read, and processes
+        loading the same file share its memory.
+
+        Keyword arguments:
+        path -- path of the file.
+        """
+        with open(path, 'rb') as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, button_count, start, max_moves, tokens_length, return_depth, \
+            return_parent, return_pressed = ReachabilityIndex.HEADER.unpack_from(data)
+        if magic != ReachabilityIndex.MAGIC or version != ReachabilityIndex.VERSION:
+            raise ValueError('\'{0}\' is not a reachability index file.'.format(path))
+
+        position = ReachabilityIndex.HEADER.size
+        tokens = bytes(data[position:position + tokens_length]).decode('utf-8')
+        position += tokens_length
+        position += ReachabilityIndex.padding(position)
+
+        size = ReachabilityIndex.SIZE
+        view = memoryview(data)
+
+        index = ReachabilityIndex.__new__(ReachabilityIndex)
+        index.start = start
+        index.max_moves = max_moves
+        index.return_depth = return_depth
+        index.return_parent = return_parent
+        index.return_pressed = return_pressed
+        index.tokens = tuple(tokens.split('\n')) if button_count else ()
+        if sys.byteorder == 'big':
+            index.parents = array('i', view[position:position + size * 4].tobytes())
+            index.parents.byteswap()
+        else:
+            index.parents = view[position:position + size * 4].cast('i')
+        position += size * 4
+        index.depths = view[position:position + size]
+        position += size
+        index.pressed = view[position:position + size]
+        return index
+
+    @staticmethod
+    def padding(length):
+        """
+        Gets the amount of bytes needed to align 'length' to 4 bytes.
+        """
+        return -length % 4
@@ -0,0 +1,72 @@
+from Level import Level
+from Operation import Operation
+
+class SequencePruner:
+    """
+    Finds, for a particular level, which button sequences are redundant
+    because another sequence reaches the same value: buttons that never
+    change the value, buttons that undo themselves when pressed twice and
+    pairs of buttons whose order doesn't matter.
+    """
+
+    def __init__(self, level):
+        """
+        SequencePruner constructor.
+
+        Keyword arguments:
+        level -- instance of Level whose sequences are pruned.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        buttons = level.get_buttons()
+        types = [button.get_operation_type() for button in buttons]
+
+        self.no_ops = frozenset(index for index, button in enumerate(buttons)
+            if SequencePruner.is_no_op(button.get_token()))
+        self.involutions = frozenset(index for index, operation_type in enumerate(types)
+            if operation_type.involution)
+        # commutes[i][j] informs if pressing i then j is the same as
+        # pressing j then i.
+        self.commutes = [[Operation.commute(types[i].name, types[j].name)
+            for j in range(len(buttons))] for i in range(len(buttons))]
+
+    @staticmethod
+    def is_no_op(operation):
+        """
+        Determines if an operation never changes the value, such as '+0'.
+
+        :param operation: (string) the operation, as shown on the button.
+        :return: a boolean.
+        """
+        return Operation.is_no_op(operation)
+
+    def is_redundant(self, previous_index, index):
+        """
+        Determines, without performing any operation, if pressing a button
+        right after another one is redundant.
+
+        Keyword arguments:
+        previous_index -- index of the button pressed before (None if no
+        button was pressed yet).
+        index -- index of the button about to be pressed.
+
+        :return: True if the button never changes the value or if it undoes
+        the previous button.
+        """
+        if index in self.no_ops:
+            return True
+        return index == previous_index and index in self.involutions
+
+    def is_out_of_order(self, previous_index, index):
+        """
+        Determines if two buttons commute and are out of their canonical
+        order (lower index first), in which case pressing them in the
+        canonical order reaches the same value. Since the value between the
+        two presses changes with the order, callers must confirm it is
+        valid in the canonical order before discarding this one.
+        """
+        return previous_index is not None and index < previous_index and \
+            self.commutes[previous_index][index]
@@ -0,0 +1,170 @@
+from Level import Level
+from Solver import Solver
+
+from collections import OrderedDict
+import json
+import sqlite3
+import time
+
+class SolutionCache:
+    """
+    Stores the solutions of levels already solved, keyed by a canonical
+    form of the level, so identical levels (even with their buttons in a
+    different order) are only solved once. Recently used solutions are kept
+    in memory and, optionally, every solution is kept in an SQLite file.
+    """
+
+    def __init__(self, path=None, max_memory_entries=1024, max_disk_entries=None):
+        """
+        SolutionCache constructor.
+
+        Keyword arguments:
+        path -- (optional) path of the SQLite file holding the solutions.
+        If not given, solutions are only kept in memory.
+        max_memory_entries -- (optional) amount of solutions kept in memory.
+        The least recently used ones are discarded first.
+        max_disk_entries -- (optional) amount of solutions kept in the file.
+        The least recently used ones are discarded first. Unbounded if not
+        given.
+        """
+
+        # Type verifications
+        if path is not None and not isinstance(path, str):
+            raise TypeError('\'path\' must be a string.')
+        if not isinstance(max_memory_entries, int):
+            raise TypeError('\'max_memory_entries\' must be an integer.')
+        if max_disk_entries is not None and not isinstance(max_disk_entries, int):
+            raise TypeError('\'max_disk_entries\' must be an integer.')
+
+        # Value verifications
+        if max_memory_entries < 0:
+            raise ValueError('\'max_memory_entries\' can\'t be lower than 0.')
+        if max_disk_entries is not None and max_disk_entries < 1:
+            raise ValueError('\'max_disk_entries\' must be a non-zero, positive integer.')
+
+        self.path = path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()
+        self.connection = None
+
+        if path is not None:
+            self.connection = sqlite3.connect(path)
+            self.connection.execute('CREATE TABLE IF NOT EXISTS solutions ('
+                'key TEXT PRIMARY KEY, solution TEXT, last_used REAL)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS solutions_last_used '
+                'ON solutions (last_used)')
+            self.connection.commit()
+
+    @staticmethod
+    def canonical_key(level, mode=Solver.BRUTE_FORCE):
+        """
+        Gets the key identifying a level in the cache.
+
+        :param level: (Level) the level being solved.
+        :param mode: (string) the mode the level is solved with, since
+        different modes may find different solutions.
+        :return: a string built from the start, goal and moves of the level
+        and its sorted set of buttons.
+        """
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        buttons = sorted(set(button.get_token() for button in level.get_buttons()))
+        return json.dumps([level.get_start(), level.get_goal(), level.get_moves(),
+            buttons, mode], separators=(',', ':'))
+
+    def lookup(self, level, mode=Solver.BRUTE_FORCE):
+        """
+        Looks for the solution of a level.
+
+        :return: a tuple with a boolean informing if the level was found
+        and its solution (which may be None, for levels with no solution).
+        """
+        key = SolutionCache.canonical_key(level, mode)
+
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return True, self.memory[key]
+
+        if self.connection is not None:
+            row = self.connection.execute('SELECT solution FROM solutions WHERE key = ?',
+                (key,)).fetchone()
+            if row is not None:
+                self.connection.execute('UPDATE solutions SET last_used = ? WHERE key = ?',
+                    (time.time(), key))
+                self.connection.commit()
+                self.remember(key, row[0])
+                return True, row[0]
+
+        return False, None
+
+    def store(self, level, solution, mode=Solver.BRUTE_FORCE):
+        """
+        Stores the solution of a level.
+
+        Keyword arguments:
+        level -- instance of Level that was solved.
+        solution -- the solution returned by Solver.solve (None if the
+        level has no solution).
+        mode -- (optional) the mode the level was solved with.
+        """
+        key = SolutionCache.canonical_key(level, mode)
+        self.remember(key, solution)
+
+        if self.connection is not None:
+            self.connection.execute('INSERT OR REPLACE INTO solutions '
+                '(key, solution, last_used) VALUES (?, ?, ?)', (key, solution, time.time()))
+
+            # Discard the least recently used solutions beyond the limit
+            if self.max_disk_entries is not None:
+                self.connection.execute('DELETE FROM solutions WHERE key IN ('
+                    'SELECT key FROM solutions ORDER BY last_used DESC LIMIT -1 OFFSET ?)',
+                    (self.max_disk_entries,))
+            self.connection.commit()
+
+    def remember(self, key, solution):
+        """
+        Keeps a solution in memory, discarding the least recently used ones
+        beyond the limit.
+        """
+        if self.max_memory_entries == 0:
+            return
+        self.memory[key] = solution
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_memory_entries:
+            self.memory.popitem(last=False)
+
+    def close(self):
+        """
+        Closes the SQLite file, if there's one.
+        """
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+
+class CachedSolver(Solver):
+    """
+    A Solver that looks levels up in a SolutionCache before solving them.
+    """
+
+    def __init__(self, cache=None):
+        """
+        CachedSolver constructor.
+
+        Keyword arguments:
+        cache -- (optional) instance of SolutionCache. If not given, a cache
+        kept only in memory is used.
+        """
+        if cache is not None and not isinstance(cache, SolutionCache):
+            raise TypeError('\'cache\' must be an instance of SolutionCache.')
+
+        self.cache = cache if cache is not None else SolutionCache()
+
+    def solve(self, level, mode=Solver.BRUTE_FORCE):
+        found, solution = self.cache.lookup(level, mode)
+        if not found:
+            solution = Solver.solve(self, level, mode)
+            self.cache.store(level, solution, mode)
+        return solution
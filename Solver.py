@@ -1,22 +1,348 @@
 from BaseXNumber import BaseXNumber
+from Checkpoint import Checkpoint
+from GameState import GameState
 from Level import Level
 from Calculator import Calculator
+from Operation import Operation
+from SequencePruner import SequencePruner
+from SolverStats import SolverStats
+from StateStore import StateStore
 
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import copy
+import itertools
 import math
-
-#TODO discard sequences where one of the actions produces no effect
+import os
 
 class Solver:
     """
     The class that wraps it all.
     """
 
-    def solve(self, level):
+    # Names of the available search modes
+    BRUTE_FORCE = 'brute_force'
+    BREADTH_FIRST = 'breadth_first'
+    DEPTH_FIRST = 'depth_first'
+    TRANSITION_TABLE = 'transition_table'
+    PARALLEL = 'parallel'
+    MEET_IN_THE_MIDDLE = 'meet_in_the_middle'
+    PRUNED = 'pruned'
+    ITERATIVE_DEEPENING = 'iterative_deepening'
+    BEST_FIRST = 'best_first'
+    MODES = (BRUTE_FORCE, BREADTH_FIRST, DEPTH_FIRST, TRANSITION_TABLE, PARALLEL,
+        MEET_IN_THE_MIDDLE, PRUNED, ITERATIVE_DEEPENING, BEST_FIRST)
+
+    # Bounds of the values the calculator can display. Any value with more
+    # than 6 characters (including the minus sign) is discarded.
+    MINIMUM_VALUE = -99999
+    MAXIMUM_VALUE = 999999
+
+    # Instance of SolverStats collecting statistics, only while solving
+    # through 'solve_with_stats'.
+    stats = None
+
+    # Instance of Checkpoint saving the progress of the search, only while
+    # solving through 'solve_resumable'.
+    checkpoint = None
+
+    def solve(self, level, mode=BRUTE_FORCE):
         """
         Static function that solves a particular level.
 
         Keyword arguments:
         level -- instance of Level that is going to be solved.
+        mode -- (optional) the search strategy used to find the solution.
+        Solver.BRUTE_FORCE (default) tries every sequence of exactly
+        'moves' presses, while Solver.BREADTH_FIRST returns the shortest
+        sequence that uses at most 'moves' presses. Solver.DEPTH_FIRST
+        returns the same solution as Solver.BRUTE_FORCE, but computes every
+        shared prefix of the sequences only once. Solver.TRANSITION_TABLE
+        gives the same kind of solution as Solver.BREADTH_FIRST, using the
+        precomputed tables of TransitionTable (requires NumPy).
+        Solver.PARALLEL returns the same solution as Solver.BRUTE_FORCE,
+        splitting the search among the processors of the machine.
+        Solver.MEET_IN_THE_MIDDLE gives the same kind of solution as
+        Solver.BREADTH_FIRST, searching from both the start and the goal.
+        Solver.PRUNED returns the first sequence found by the depth-first
+        search that uses at most 'moves' presses, skipping sequences that
+        are redundant (see SequencePruner). Solver.ITERATIVE_DEEPENING
+        returns the shortest sequence that uses at most 'moves' presses,
+        trying longer sequences only when there are no shorter ones.
+        Solver.BEST_FIRST returns the same kind of solution, exploring first
+        the values closest to the goal (see BestFirstSolver).
+
+        Levels with stateful buttons (such as '[+]1' or 'Store') are always
+        solved by 'game_state_search', giving the same kind of solution as
+        the mode.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        if level.is_stateful():
+            if mode not in Solver.MODES:
+                raise ValueError('\'mode\' must be one of the modes defined in Solver.')
+            return self.game_state_search(level,
+                exact=mode in (Solver.BRUTE_FORCE, Solver.DEPTH_FIRST, Solver.PARALLEL))
+
+        if mode == Solver.BREADTH_FIRST:
+            return self.breadth_first_search(level)
+        elif mode == Solver.DEPTH_FIRST:
+            return self.depth_first_search(level)
+        elif mode == Solver.TRANSITION_TABLE:
+            # Imported here so NumPy is only needed when this mode is used
+            from TransitionTable import TransitionTable
+            return TransitionTable(level).solve()
+        elif mode == Solver.PARALLEL:
+            return self.parallel_search(level)
+        elif mode == Solver.MEET_IN_THE_MIDDLE:
+            return self.meet_in_the_middle_search(level)
+        elif mode == Solver.PRUNED:
+            return self.pruned_search(level)
+        elif mode == Solver.ITERATIVE_DEEPENING:
+            return self.iterative_deepening_search(level)
+        elif mode == Solver.BEST_FIRST:
+            # Imported here since BestFirstSolver depends on this module
+            from BestFirstSolver import BestFirstSolver
+            return BestFirstSolver().solve(level)
+        elif mode != Solver.BRUTE_FORCE:
+            raise ValueError('\'mode\' must be one of the modes defined in Solver.')
+
+        return self.brute_force_search(level)
+
+    def solve_with_stats(self, level, mode=BRUTE_FORCE, hook=None, interval=10000,
+            time_operations=True):
+        """
+        Solves a level like 'solve', collecting statistics about the search.
+        The statistics are only collected by the modes that search in this
+        process (brute force, depth-first, breadth-first and pruned).
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        mode -- (optional) the search strategy, as in 'solve'.
+        hook -- (optional) function called with the SolverStats instance
+        every 'interval' sequences tried or states expanded.
+        interval -- (optional) how often 'hook' is called.
+        time_operations -- (optional) whether to record the time spent on
+        each type of operation, which slows the search down.
+
+        :return: a tuple with the solution and the SolverStats instance.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        stats = SolverStats(hook, interval)
+        # Time the operations on a copy of the level, so the level itself
+        # isn't slowed down.
+        if time_operations:
+            level = copy.copy(level)
+            level.buttons = stats.time_buttons(level.get_buttons())
+
+        self.stats = stats
+        try:
+            solution = self.solve(level, mode)
+        finally:
+            self.stats = None
+            stats.finish()
+
+        return solution, stats
+
+    def solve_resumable(self, level, path, mode=BRUTE_FORCE, interval=60.0):
+        """
+        Solves a level like 'solve', saving its progress to a checkpoint
+        file every 'interval' seconds. If the file already holds the
+        progress of the same level and mode (left by an interrupted solve),
+        the search continues from there, giving the same solution as an
+        uninterrupted solve. The file is deleted once the search finishes.
+
+        Only Solver.BRUTE_FORCE, Solver.DEPTH_FIRST and Solver.BREADTH_FIRST
+        can be resumed.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        path -- path of the checkpoint file.
+        mode -- (optional) the search strategy, as in 'solve'.
+        interval -- (optional) minimum amount of seconds between saves.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        # Value verifications
+        if mode not in (Solver.BRUTE_FORCE, Solver.DEPTH_FIRST, Solver.BREADTH_FIRST):
+            raise ValueError('\'mode\' must be Solver.BRUTE_FORCE, Solver.DEPTH_FIRST or '
+                'Solver.BREADTH_FIRST.')
+        if level.is_stateful():
+            raise ValueError('levels with stateful buttons can\'t be resumed.')
+
+        checkpoint = Checkpoint(path, interval)
+        state = None
+        saved = checkpoint.load()
+        if saved is not None:
+            saved_level, saved_mode, state = saved
+            if Checkpoint.level_definition(saved_level) != Checkpoint.level_definition(level) \
+                    or saved_mode != mode:
+                raise ValueError('\'{0}\' holds the progress of another level or mode.'
+                    .format(path))
+
+        checkpoint.start(level, mode)
+        self.checkpoint = checkpoint
+        try:
+            if mode == Solver.DEPTH_FIRST:
+                solution = self.depth_first_search(level,
+                    state['sequence'] if state else None)
+            elif mode == Solver.BREADTH_FIRST:
+                solution = self.breadth_first_search(level, state)
+            else:
+                solution = self.brute_force_search(level,
+                    state['counter'] if state else None)
+        finally:
+            self.checkpoint = None
+
+        checkpoint.remove()
+        return solution
+
+    def resume(self, path, interval=60.0):
+        """
+        Continues the solve whose progress was saved to a checkpoint file,
+        with the level and mode stored in it (see 'solve_resumable').
+
+        Keyword arguments:
+        path -- path of the checkpoint file.
+        interval -- (optional) minimum amount of seconds between saves.
+        """
+        saved = Checkpoint(path).load()
+        if saved is None:
+            raise ValueError('there\'s no checkpoint at \'{0}\'.'.format(path))
+
+        level, mode, _ = saved
+        return self.solve_resumable(level, path, mode, interval)
+
+    def solutions(self, level, max_moves=None):
+        """
+        Lazily yields every solution of a level, shortest first (and, among
+        solutions of the same length, in the order of the counter used by
+        'solve'). Sequences end as soon as they reach the goal, just like
+        in the game. Only the sequence being tried is kept in memory, so
+        consumers can stop at any point.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        max_moves -- (optional) the maximum amount of presses of the
+        solutions. Defaults to the moves of the level.
+
+        :return: a generator of tuples with the buttons of each solution.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+        if max_moves is not None and not isinstance(max_moves, int):
+            raise TypeError('\'max_moves\' must be an integer.')
+
+        # Value verifications
+        if level.is_stateful():
+            raise ValueError('the solutions of levels with stateful buttons can\'t be listed.')
+
+        if max_moves is None:
+            max_moves = level.get_moves()
+
+        buttons = level.get_buttons()
+        goal = level.get_goal()
+        # Buttons pressed so far
+        sequence = []
+
+        def search(value, moves_left):
+            """
+            Yields every sequence of exactly 'moves_left' presses starting at
+            'value' that only reaches the goal on its last press.
+            """
+            for button in buttons:
+                result = Solver.normalize_value(button(value))
+                if result is None:
+                    continue
+
+                sequence.append(button.get_token())
+                if moves_left == 1:
+                    if result == goal:
+                        yield tuple(sequence)
+                # Reaching the goal ends the game, so there's no point in
+                # pressing more buttons.
+                elif result != goal:
+                    yield from search(result, moves_left - 1)
+                sequence.pop()
+
+        # Try every length, from the shortest
+        for moves in range(1, max_moves + 1):
+            yield from search(level.get_start(), moves)
+
+    def shortest_solutions(self, level, k, max_moves=None):
+        """
+        Gets the 'k' shortest solutions of a level (see 'solutions').
+
+        :return: a list with up to 'k' tuples of buttons.
+        """
+        if not isinstance(k, int):
+            raise TypeError('\'k\' must be an integer.')
+
+        return list(itertools.islice(self.solutions(level, max_moves), k))
+
+    def sequence_works(self, sequence):
+        """
+        Tries a particular sequence of operations.
+
+        Keyword arguments:
+        sequence -- a string of digits (such as a counter value) or a list
+        of integers, each one the index of a button of the level.
+        """
+        if self.stats is not None:
+            self.stats.sequence_tried()
+
+        # Convert the sequence to array of integers
+        if isinstance(sequence, str):
+            sequence = [int(digit) for digit in sequence]
+        # Get the level from the instance's calculator
+        level = self.calculator.get_level()
+        get_button = level.get_button_unchecked
+        # Start from the original value, without resetting the calculator
+        current_value = level.get_start()
+
+        # Iterate throught the values of the array above
+        for digit in sequence:
+            # Perform the operation defined by the button the digit maps to
+            current_value = get_button(digit)(int(current_value))
+            # If the number has a non-zero decimal part, it doesn't work,
+            # as there are no levels where the goal is a decimal number.
+            if math.fabs(int(current_value)) < math.fabs(current_value):
+                if self.stats is not None:
+                    self.stats.record_prune(current_value)
+                return False
+            # Results of divisions are floats, so only the integer part is
+            # measured (the calculator shows 12.0 as 12).
+            elif len(str(int(current_value))) > 6:
+                if self.stats is not None:
+                    self.stats.record_prune(current_value)
+                return False
+
+        # If the sequence successfully arrived at the desired result
+        if current_value == level.get_goal():
+            return True            
+        else:
+            return False
+
+    def brute_force_search(self, level, position=None):
+        """
+        The search performed by 'solve' with Solver.BRUTE_FORCE.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        position -- (optional) string with the value of the counter to
+        start from, skipping the sequences before it.
         """
 
         # Type verifications
@@ -35,8 +361,9 @@ class Solver:
         # then +3, and finally, +3 again.
 
         # Initialize the counter with Y zeroes, where Y is the amount of
-        # moves for this particular level.
-        counter_initial_value = '0'*level.get_moves()
+        # moves for this particular level (or where a previous search
+        # stopped).
+        counter_initial_value = position if position is not None else '0'*level.get_moves()
         # Set the base to the amount of buttons
         counter_base = len(level.get_buttons())
         # Initialize the counter with the variables defined above
@@ -49,60 +376,709 @@ class Solver:
         self.calculator = calculator
         self.counter = counter
 
-        # Try the first possible sequence (a string of zeroes)
-        if self.sequence_works(counter.value):
-            return self.counter_to_buttons(counter.value)
+        checkpoint = self.checkpoint
+
+        # Try every sequence, starting with a string of zeroes. Since
+        # overflow for the counter is False, incrementing it fails once it
+        # reaches the maximum value. That's the stopping condition.
+        while True:
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save({'counter': counter.get_value()})
+            # Try the current sequence
+            if self.sequence_works(counter.get_digits()):
+                return self.counter_to_buttons(counter.get_digits())
+            # If it didn't work, increase the counter by 1
+            if not counter.increment():
+                return None
+
+    def breadth_first_search(self, level, position=None):
+        """
+        Solves a level by exploring the values the calculator can reach,
+        one move at a time. Sequences that reach the same value with the
+        same amount of moves left are collapsed into one, so each value is
+        only expanded once.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        position -- (optional) dictionary saved by a checkpoint, with the
+        moves already explored, the frontier and the visited values, to
+        continue the search from.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.calculator = Calculator(level)
+
+        buttons = level.get_buttons()
+        goal = level.get_goal()
+        start = level.get_start()
+        stats = self.stats
+        checkpoint = self.checkpoint
+
+        if position is None:
+            # Records every value reached so far, along with the value it
+            # was reached from and the index of the button that was pressed
+            # to get there, using a few megabytes at most regardless of the
+            # buttons.
+            visited = StateStore(Solver.MINIMUM_VALUE, Solver.MAXIMUM_VALUE, len(buttons))
+            # Maps the values reached from a start the calculator can't
+            # display (which can't be stored) to the index of the button
+            # pressed to reach them.
+            roots = {}
+            explored = 0
+            if Solver.normalize_value(start) is not None:
+                visited.add(start)
+                frontier = array('i', [start])
+            else:
+                # Expand the start directly, storing its results without a
+                # parent.
+                frontier = array('i')
+                explored = 1
+                if stats is not None:
+                    stats.state_expanded()
+                for index, button in enumerate(buttons):
+                    raw_result = button(start)
+                    result = Solver.normalize_value(raw_result)
+                    if result is None:
+                        if stats is not None:
+                            stats.record_prune(raw_result)
+                        continue
+                    if result == goal:
+                        return self.counter_to_buttons([index])
+                    if visited.add(result):
+                        roots[result] = index
+                        frontier.append(result)
         else:
-            # Since overflow for the counter is False, when it reaches
-            # the maximum value and adds 1 again, it will remain the same.
-            # That's the stopping condition.
-            break_next = False
-            while not break_next:
-                # If it's currently at the last position of the counter,
-                # set break_next to true so the while ends.
-                if counter + 1 == counter:
-                    break_next = True
-                
-                # Try the current sequence
-                if self.sequence_works(counter.value):
-                    return self.counter_to_buttons(counter.value)                
-                # If it didn't work, increase the counter by 1
-                counter += 1            
+            visited = StateStore.from_bytes(Solver.MINIMUM_VALUE, Solver.MAXIMUM_VALUE,
+                len(buttons), Checkpoint.decode_bytes(position['visited']))
+            frontier = Checkpoint.decode_array(position['frontier'])
+            explored = position['explored']
+            roots = {value: index for value, index in position.get('roots', [])}
+        visit = visited.add
 
-    def sequence_works(self, sequence):
+        def get_path(value):
+            """
+            Gets the indexes of the buttons pressed to reach a value.
+            """
+            path = visited.get_path(value)
+            if roots:
+                # Prepend the press that reached the value stored first
+                parent = visited.get_parent(value)
+                while parent is not None:
+                    value = parent[0]
+                    parent = visited.get_parent(value)
+                path.insert(0, roots[value])
+            return path
+
+        for moves in range(explored, level.get_moves()):
+            # Progress is only saved between moves, when the frontier is
+            # complete.
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save({
+                    'explored': moves,
+                    'frontier': Checkpoint.encode_array(frontier),
+                    'visited': Checkpoint.encode_bytes(visited.to_bytes()),
+                    'roots': sorted(roots.items())
+                })
+
+            next_frontier = array('i')
+
+            for value in frontier:
+                if stats is not None:
+                    stats.state_expanded()
+
+                for index, button in enumerate(buttons):
+                    # Perform the already compiled operation directly
+                    raw_result = button(value)
+                    result = Solver.normalize_value(raw_result)
+
+                    # Discard results the calculator can't display
+                    if result is None:
+                        if stats is not None:
+                            stats.record_prune(raw_result)
+                        continue
+
+                    # If the goal was reached, rebuild the path that led to it
+                    if result == goal:
+                        return self.counter_to_buttons(get_path(value) + [index])
+
+                    # Only expand values that weren't reached before, since
+                    # they were reached with fewer (or the same) moves.
+                    if visit(result, value, index):
+                        next_frontier.append(result)
+
+            frontier = next_frontier
+
+        return None
+
+    def depth_first_search(self, level, position=None):
         """
-        Tries a particular sequence of operations.
+        Solves a level trying the sequences in the same order as the counter
+        used by 'solve', but carrying the intermediate value down the
+        recursion, so each prefix is computed exactly once. A prefix is
+        abandoned as soon as it produces a value the calculator can't
+        display.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        position -- (optional) list with the button indexes of the sequence
+        to start from, skipping the sequences before it.
         """
-        # Reset the calculator to the original state
-        self.calculator.clear()
-        # Convert the sequence to array of integers
-        sequence = [int(digit) for digit in sequence]
-        # Get the level from the instance's calculator
-        level = self.calculator.get_level()
 
-        # Iterate throught the values of the array above
-        for digit in sequence:
-            # Map the digit to its corresponding button
-            button = level.get_button_at(digit)
-            # Perform the operation defined by the button
-            self.calculator.perform_operation(button)
-            # Create an alias for 'current_value' to reduce the length
-            # of the if line below.
-            current_value = self.calculator.get_current_value()
-            # If the number has a non-zero decimal part, it doesn't work,
-            # as there are no levels where the goal is a decimal number.
-            if math.fabs(int(current_value)) < math.fabs(current_value):
-                return False
-            elif len(str(current_value)) > 6:
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.calculator = Calculator(level)
+
+        sequence = self.depth_first_sequence(level, position=position)
+        if sequence is not None:
+            return self.counter_to_buttons(sequence)
+        return None
+
+    def depth_first_sequence(self, level, prefix=(), position=None):
+        """
+        The search performed by 'depth_first_search'.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        prefix -- (optional) indexes of the buttons every tried sequence
+        must start with.
+        position -- (optional) indexes of the buttons of the sequence to
+        start from (including the prefix), skipping the sequences before
+        it.
+
+        :return: the list of button indexes of the first solution, or None.
+        """
+        buttons = level.get_buttons()
+        goal = level.get_goal()
+        stats = self.stats
+        checkpoint = self.checkpoint
+        # Indexes of the buttons pressed so far
+        sequence = list(prefix)
+
+        def search(value, moves_left, first=0):
+            """
+            Tries every sequence of 'moves_left' presses starting at 'value',
+            skipping the ones that start with buttons before 'first'.
+
+            :return: a boolean informing if a solution was found, in which
+            case 'sequence' holds it.
+            """
+            # Save the first sequence this call is about to try, if any
+            if checkpoint is not None and first < len(buttons) and checkpoint.due():
+                remaining = [first] + [0] * (moves_left - 1) if moves_left else []
+                checkpoint.save({'sequence': sequence + remaining})
+
+            # Only the value after the last move is compared to the goal
+            if moves_left == 0:
+                if stats is not None:
+                    stats.sequence_tried()
+                return value == goal
+
+            if stats is not None:
+                stats.state_expanded()
+
+            for index, button in enumerate(buttons[first:], first):
+                raw_result = button(value)
+                result = Solver.normalize_value(raw_result)
+                # Prune every sequence starting with this prefix
+                if result is None:
+                    if stats is not None:
+                        stats.record_prune(raw_result)
+                    continue
+
+                sequence.append(index)
+                if search(result, moves_left - 1):
+                    return True
+                sequence.pop()
+
+            return False
+
+        # Press the buttons of the prefix before searching
+        value = level.get_start()
+        for index in prefix:
+            value = Solver.normalize_value(buttons[index](value))
+            if value is None:
+                return None
+
+        moves_left = level.get_moves() - len(prefix)
+        if position is None:
+            if search(value, moves_left):
+                return sequence
+            return None
+
+        # Press the buttons of the position, keeping the value before each
+        # press (None once a press can't be displayed).
+        path = list(position[len(prefix):])
+        values = [value]
+        for index in path:
+            if value is not None:
+                value = Solver.normalize_value(buttons[index](value))
+            values.append(value)
+
+        # Try the position itself, then the sequences after it: those that
+        # share all but its last press, then all but its last two presses,
+        # and so on.
+        for depth in range(len(path), -1, -1):
+            if values[depth] is None:
+                continue
+            del sequence[len(prefix):]
+            sequence.extend(path[:depth])
+            if depth == len(path):
+                found = search(values[depth], 0)
+            else:
+                found = search(values[depth], moves_left - depth, path[depth] + 1)
+            if found:
+                return sequence
+        return None
+
+    def pruned_search(self, level):
+        """
+        Solves a level with a depth-first search that skips every sequence
+        reaching a value another explored sequence reaches with the same
+        or fewer presses: presses that don't change the value, presses that
+        return to the value before the previous one (such as '+/-' twice)
+        and pairs of commuting buttons (such as '+2' and '+3') pressed out
+        of order. Since skipping a press makes a sequence shorter, the goal
+        is checked after every press, so the solution uses at most 'moves'
+        presses.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        # Every rule above relies on a shorter sequence reaching the same
+        # value, which doesn't hold for the empty sequence when the level
+        # starts at its goal.
+        if level.get_start() == level.get_goal():
+            return self.breadth_first_search(level)
+
+        self.calculator = Calculator(level)
+
+        pruner = SequencePruner(level)
+        buttons = level.get_buttons()
+        goal = level.get_goal()
+        stats = self.stats
+        # Indexes of the buttons pressed so far
+        sequence = []
+
+        def search(value, previous_value, moves_left):
+            """
+            Tries every non-redundant sequence of up to 'moves_left' presses
+            starting at 'value', which was reached from 'previous_value'.
+
+            :return: a boolean informing if a solution was found, in which
+            case 'sequence' holds it.
+            """
+            if stats is not None:
+                stats.state_expanded()
+
+            previous_index = sequence[-1] if sequence else None
+
+            for index, button in enumerate(buttons):
+                if pruner.is_redundant(previous_index, index):
+                    continue
+                # Commuting buttons are only pressed out of order if the
+                # canonical order produces a value the calculator can't show.
+                if pruner.is_out_of_order(previous_index, index) and \
+                        Solver.normalize_value(button(previous_value)) is not None:
+                    continue
+
+                raw_result = button(value)
+                result = Solver.normalize_value(raw_result)
+                if result is None:
+                    if stats is not None:
+                        stats.record_prune(raw_result)
+                    continue
+                # Skip presses without effect or that undo the previous one
+                if result == value or result == previous_value:
+                    continue
+
+                sequence.append(index)
+                if result == goal:
+                    return True
+                if moves_left > 1 and search(result, value, moves_left - 1):
+                    return True
+                sequence.pop()
+
+            return False
+
+        if search(level.get_start(), None, level.get_moves()):
+            return self.counter_to_buttons(sequence)
+        return None
+
+    def iterative_deepening_search(self, level):
+        """
+        Solves a level with depth-first searches limited to 1, 2, ... up to
+        'moves' presses, so the first solution found is also the shortest
+        (and, among the shortest, the first in the order of the counter
+        used by 'solve'). A transposition table, kept across the searches,
+        records for every value how many presses were already proven not
+        to reach the goal from it, so those values aren't searched again.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.calculator = Calculator(level)
+
+        buttons = level.get_buttons()
+        goal = level.get_goal()
+        stats = self.stats
+        # Maps values to the amount of presses known not to reach the goal
+        # from them. Since the goal is checked after every press, a failed
+        # search of N presses covers every shorter sequence too.
+        failures = {}
+        # Indexes of the buttons pressed so far
+        sequence = []
+
+        def search(value, moves_left):
+            """
+            Tries every sequence of up to 'moves_left' presses starting at
+            'value'.
+
+            :return: a boolean informing if a solution was found, in which
+            case 'sequence' holds it.
+            """
+            if failures.get(value, 0) >= moves_left:
                 return False
 
-        # If the sequence successfully arrived at the desired result
-        if self.calculator.get_current_value() == level.get_goal():
-            return True            
-        else:
+            if stats is not None:
+                stats.state_expanded()
+
+            for index, button in enumerate(buttons):
+                raw_result = button(value)
+                result = Solver.normalize_value(raw_result)
+                if result is None:
+                    if stats is not None:
+                        stats.record_prune(raw_result)
+                    continue
+
+                sequence.append(index)
+                if result == goal:
+                    return True
+                if moves_left > 1 and search(result, moves_left - 1):
+                    return True
+                sequence.pop()
+
+            failures[value] = moves_left
             return False
 
+        for moves in range(1, level.get_moves() + 1):
+            if search(level.get_start(), moves):
+                return self.counter_to_buttons(sequence)
+
+        return None
+
+    def meet_in_the_middle_search(self, level):
+        """
+        Solves a level searching forwards from the start and backwards from
+        the goal (undoing the operations of the buttons) at the same time,
+        one move at a time on the side with fewer values, until both sides
+        meet. Returns the shortest sequence that uses at most 'moves'
+        presses. If any button can't be undone (see Operation.get_inverse),
+        the level is solved with 'breadth_first_search' instead.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        buttons = level.get_buttons()
+        inverses = [Operation.get_inverse(button.get_token()) for button in buttons]
+        start = level.get_start()
+        goal = Solver.normalize_value(level.get_goal())
+
+        # Without every inverse, the backward search would miss sequences
+        if None in inverses or goal is None or goal == start:
+            return self.breadth_first_search(level)
+
+        self.calculator = Calculator(level)
+
+        # Maps the values reached from the start to the value they were
+        # reached from, the index of the button pressed and the moves used.
+        forward = {start: (None, None, 0)}
+        # Maps the values that reach the goal to the value they lead to, the
+        # index of the button pressed and the moves needed.
+        backward = {goal: (None, None, 0)}
+        forward_frontier = [start]
+        backward_frontier = [goal]
+        forward_depth = 0
+        backward_depth = 0
+
+        while forward_depth + backward_depth < level.get_moves() and \
+                forward_frontier and backward_frontier:
+            # Each meeting is a value reached from the start, the index of a
+            # button and the value it leads to, which reaches the goal.
+            meetings = []
+
+            if len(forward_frontier) <= len(backward_frontier):
+                next_frontier = []
+                for value in forward_frontier:
+                    for index, button in enumerate(buttons):
+                        result = Solver.normalize_value(button(value))
+                        if result is None:
+                            continue
+                        if result in backward:
+                            meetings.append((value, index, result))
+                        if result not in forward:
+                            forward[result] = (value, index, forward_depth + 1)
+                            next_frontier.append(result)
+                forward_frontier = next_frontier
+                forward_depth += 1
+            else:
+                next_frontier = []
+                for value in backward_frontier:
+                    for index, inverse in enumerate(inverses):
+                        for candidate in inverse(value):
+                            # Only keep candidates the calculator can show
+                            # and that actually lead to the value.
+                            if Solver.normalize_value(candidate) is None or \
+                                    Solver.normalize_value(buttons[index](candidate)) != value:
+                                continue
+                            if candidate in forward:
+                                meetings.append((candidate, index, value))
+                            if candidate not in backward:
+                                backward[candidate] = (value, index, backward_depth + 1)
+                                next_frontier.append(candidate)
+                backward_frontier = next_frontier
+                backward_depth += 1
+
+            if meetings:
+                # Pick the meeting with the fewest moves in total
+                value, index, result = min(meetings,
+                    key=lambda meeting: forward[meeting[0]][2] + backward[meeting[2]][2])
+
+                # Rebuild the path from the start to the meeting
+                sequence = []
+                while forward[value][0] is not None:
+                    value, parent_index, _ = forward[value]
+                    sequence.append(parent_index)
+                sequence.reverse()
+                sequence.append(index)
+
+                # And from the meeting to the goal
+                while backward[result][0] is not None:
+                    result, child_index, _ = backward[result]
+                    sequence.append(child_index)
+
+                return self.counter_to_buttons(sequence)
+
+        return None
+
+    def game_state_search(self, level, exact=False):
+        """
+        Solves a level with stateful buttons, whose presses depend on (and
+        change) the operands of the buttons and the stored value besides the
+        value shown. Sequences reaching the same GameState are collapsed,
+        just like other searches collapse sequences reaching the same value.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        exact -- (optional) if True, returns the first sequence of exactly
+        'moves' presses in the order of the counter used by 'solve' (like
+        Solver.BRUTE_FORCE). Otherwise, returns the shortest sequence that
+        uses at most 'moves' presses (like Solver.BREADTH_FIRST).
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.calculator = Calculator(level)
+
+        goal = level.get_goal()
+        indexes = range(len(level.get_buttons()))
+        stats = self.stats
+
+        def press(state, index):
+            """
+            Presses a button, returning the new state or None if the button
+            can't be pressed or the calculator can't display the result.
+            """
+            result = state.press(level, index)
+            if result is None:
+                return None
+            value = Solver.normalize_value(result.get_value())
+            if value is None:
+                if stats is not None:
+                    stats.record_prune(result.get_value())
+                return None
+            # Fractional values that are whole numbers are kept as integers
+            if not isinstance(result.get_value(), int):
+                result = GameState(value, result.get_operands(), result.get_stored())
+            return result
+
+        start = GameState.from_level(level)
+
+        if exact:
+            # States already proven not to reach the goal with exactly that
+            # many presses left.
+            failures = set()
+            sequence = []
+
+            def search(state, moves_left):
+                if moves_left == 0:
+                    if stats is not None:
+                        stats.sequence_tried()
+                    return state.get_value() == goal
+                if (state, moves_left) in failures:
+                    return False
+
+                if stats is not None:
+                    stats.state_expanded()
+                for index in indexes:
+                    result = press(state, index)
+                    if result is None:
+                        continue
+                    sequence.append(index)
+                    if search(result, moves_left - 1):
+                        return True
+                    sequence.pop()
+
+                failures.add((state, moves_left))
+                return False
+
+            if search(start, level.get_moves()):
+                return self.counter_to_buttons(sequence)
+            return None
+
+        # Maps every state reached so far to the state it was reached from
+        # and the index of the button that was pressed to get there.
+        parents = {start: None}
+        frontier = [start]
+
+        for _ in range(level.get_moves()):
+            next_frontier = []
+
+            for state in frontier:
+                if stats is not None:
+                    stats.state_expanded()
+
+                for index in indexes:
+                    result = press(state, index)
+                    if result is None:
+                        continue
+
+                    # If the goal was reached, rebuild the path that led to it
+                    if result.get_value() == goal:
+                        sequence = [index]
+                        while parents[state] is not None:
+                            state, parent_index = parents[state]
+                            sequence.append(parent_index)
+                        sequence.reverse()
+                        return self.counter_to_buttons(sequence)
+
+                    if result not in parents:
+                        parents[result] = (state, index)
+                        next_frontier.append(result)
+
+            frontier = next_frontier
+
+        return None
+
+    def parallel_search(self, level, workers=None, prefix_length=None):
+        """
+        Solves a level splitting the sequences by their first buttons into
+        shards, which are searched by a pool of processes. The shards are
+        numbered in the order of the counter used by 'solve', and the
+        solution of the first shard that has one is returned, so the result
+        is the same as the serial search.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        workers -- (optional) amount of processes. Defaults to the amount
+        of processors of the machine.
+        prefix_length -- (optional) amount of leading buttons that define
+        a shard. Defaults to the smallest length giving every process a few
+        shards.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.calculator = Calculator(level)
+
+        workers = workers or os.cpu_count() or 1
+        button_count = len(level.get_buttons())
+
+        if prefix_length is None:
+            prefix_length = 1
+            while button_count ** prefix_length < workers * 4 and \
+                    prefix_length < level.get_moves():
+                prefix_length += 1
+        prefix_length = min(prefix_length, level.get_moves())
+
+        prefixes = list(itertools.product(range(button_count), repeat=prefix_length))
+        results = [None] * len(prefixes)
+        finished = [False] * len(prefixes)
+        # Index of the first shard that didn't finish yet
+        pending = 0
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        try:
+            futures = {executor.submit(solve_shard, level, prefix): position
+                for position, prefix in enumerate(prefixes)}
+
+            for future in as_completed(futures):
+                position = futures[future]
+                results[position] = future.result()
+                finished[position] = True
+
+                # Every shard before the first unfinished one was searched,
+                # so the first of them with a solution is the answer.
+                while pending < len(prefixes) and finished[pending]:
+                    if results[pending] is not None:
+                        return self.counter_to_buttons(results[pending])
+                    pending += 1
+        finally:
+            # Drop the shards that didn't start, without waiting for the
+            # ones still running.
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        return None
+
+    @staticmethod
+    def normalize_value(value):
+        """
+        Applies the rules of 'sequence_works' to a single value.
+
+        :param value: (int or float) the value shown by the calculator.
+        :return: the value as an integer, or None if the calculator can't
+        display it (non-integer result or more than 6 characters).
+        """
+        # If the number has a non-zero decimal part, it doesn't work,
+        # as there are no levels where the goal is a decimal number.
+        if value != int(value):
+            return None
+        value = int(value)
+        if not Solver.MINIMUM_VALUE <= value <= Solver.MAXIMUM_VALUE:
+            return None
+        return value
+
     def counter_to_buttons(self, sequence):
+        """
+        Maps a sequence of button indexes to the readable solution.
+
+        Keyword arguments:
+        sequence -- a string of digits (such as a counter value) or a list
+        of integers, each one the index of a button of the level.
+        """
         # Convert the string to array of digits
         sequence = [int(digit) for digit in sequence]
         # Get the level from the instance's calculator
@@ -114,7 +1090,21 @@ class Solver:
         for digit in sequence:
             # Map the digit to the corresponding button and add it to the
             # buttons array.
-            buttons.append(level.get_button_at(digit))
+            buttons.append(level.get_button_at(digit).get_token())
 
         # Join the array with arrows and return the string.
         return ' => '.join(buttons)
+
+
+def solve_shard(level, prefix):
+    """
+    Searches the sequences of a level that start with the given buttons.
+    Defined at module level so it can be sent to other processes.
+
+    Keyword arguments:
+    level -- instance of Level that is going to be solved.
+    prefix -- indexes of the buttons every tried sequence must start with.
+
+    :return: the list of button indexes of the first solution, or None.
+    """
+    return Solver().depth_first_sequence(level, prefix)
@@ -0,0 +1,176 @@
+from Level import Level
+from SolutionCache import SolutionCache
+from Solver import Solver
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+class SolveCancelled(Exception):
+    pass
+
+class SolveJob:
+    """
+    A solve running in the executor of a SolverService, shared by every
+    request for the same level.
+    """
+
+    __slots__ = ('future', 'cancel_event', 'waiters')
+
+    def __init__(self, future, cancel_event):
+        self.future = future
+        self.cancel_event = cancel_event
+        self.waiters = 0
+
+class SolverService:
+    """
+    Solves levels from asyncio code without blocking the event loop. Solves
+    run in an executor, concurrent requests for the same level share a
+    single solve and every request may have its own deadline. A solve is
+    cancelled (from inside its search loop) once every request waiting for
+    it gave up.
+    """
+
+    # Amount of latencies kept for the metrics
+    LATENCY_SAMPLES = 1000
+
+    def __init__(self, max_workers=None, mode=Solver.DEPTH_FIRST, check_interval=1000):
+        """
+        SolverService constructor.
+
+        Keyword arguments:
+        max_workers -- (optional) amount of threads solving levels.
+        mode -- (optional) the mode passed to Solver.solve. Only the modes
+        that report their progress (brute force, depth-first, breadth-first
+        and pruned) can be cancelled while searching.
+        check_interval -- (optional) amount of sequences tried or states
+        expanded between checks for cancellation.
+        """
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.mode = mode
+        self.check_interval = check_interval
+        # Solves running, by the canonical key of their level
+        self.jobs = {}
+        self.requests = 0
+        self.coalesced = 0
+        self.timeouts = 0
+        self.cancelled = 0
+        self.latencies = deque(maxlen=SolverService.LATENCY_SAMPLES)
+
+    async def solve(self, level, timeout=None):
+        """
+        Solves a level.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be solved.
+        timeout -- (optional) seconds to wait for the solution before
+        raising asyncio.TimeoutError.
+
+        :return: the solution returned by Solver.solve.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        self.requests += 1
+        started = time.perf_counter()
+        key = SolutionCache.canonical_key(level, self.mode)
+
+        job = self.jobs.get(key)
+        if job is None:
+            job = self.start_job(key, level)
+        else:
+            self.coalesced += 1
+
+        job.waiters += 1
+        try:
+            # Shield the solve, so a request that times out doesn't cancel
+            # it for the other requests.
+            return await asyncio.wait_for(asyncio.shield(job.future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            job.waiters -= 1
+            # Nobody is waiting for the solve anymore, so stop searching
+            if job.waiters == 0 and not job.future.done():
+                job.cancel_event.set()
+                self.cancelled += 1
+                if self.jobs.get(key) is job:
+                    del self.jobs[key]
+            self.latencies.append(time.perf_counter() - started)
+
+    def start_job(self, key, level):
+        """
+        Starts solving a level in the executor.
+        """
+        cancel_event = threading.Event()
+        future = asyncio.get_running_loop().run_in_executor(self.executor,
+            self.run_solve, level, cancel_event)
+        job = SolveJob(future, cancel_event)
+        self.jobs[key] = job
+
+        def finished(future):
+            if self.jobs.get(key) is job:
+                del self.jobs[key]
+            # Retrieve the exception of cancelled solves, which nobody awaits
+            if not future.cancelled():
+                future.exception()
+
+        future.add_done_callback(finished)
+        return job
+
+    def run_solve(self, level, cancel_event):
+        """
+        Solves a level in a thread of the executor, checking for
+        cancellation as the search progresses.
+        """
+        def check(stats):
+            if cancel_event.is_set():
+                raise SolveCancelled()
+
+        solution, _ = Solver().solve_with_stats(level, self.mode, hook=check,
+            interval=self.check_interval, time_operations=False)
+        return solution
+
+    def get_metrics(self):
+        """
+        Gets the metrics of the service.
+
+        :return: a dictionary with the solves running (queue depth), the
+        requests waiting for them, the totals of requests, coalesced
+        requests, timeouts and cancelled solves, and latency percentiles
+        (in seconds) of the latest requests.
+        """
+        latencies = sorted(self.latencies)
+
+        def percentile(fraction):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(fraction * len(latencies)))]
+
+        return {
+            'queue_depth': len(self.jobs),
+            'waiters': sum(job.waiters for job in self.jobs.values()),
+            'requests': self.requests,
+            'coalesced': self.coalesced,
+            'timeouts': self.timeouts,
+            'cancelled': self.cancelled,
+            'latency': {
+                'p50': percentile(0.5),
+                'p95': percentile(0.95),
+                'max': latencies[-1] if latencies else None
+            }
+        }
+
+    def close(self):
+        """
+        Cancels every running solve and stops the executor.
+        """
+        for job in self.jobs.values():
+            job.cancel_event.set()
+        self.jobs.clear()
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,198 @@
+from Level import Level
+from Solver import Solver
+
+class SolverSession:
+    """
+    Solves a level that is being edited, keeping what was explored between
+    the edits. The result of pressing every button on every value reached
+    is cached by button, so adding a button only performs the new button,
+    removing one only drops its results, raising the moves only explores
+    the extra moves and changing the goal (or lowering the moves) doesn't
+    explore anything. Solutions are the same as Solver.BREADTH_FIRST.
+    """
+
+    def __init__(self, level):
+        """
+        SolverSession constructor.
+
+        Keyword arguments:
+        level -- instance of Level that is going to be edited.
+        """
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        # Value verifications
+        if level.is_stateful():
+            raise ValueError('levels with stateful buttons aren\'t supported.')
+
+        self.level = level
+        # For every button (by its token), the value each explored value
+        # turns into when it is pressed (None if it can't be displayed).
+        self.edges = {}
+        self.reset()
+
+    def reset(self):
+        """
+        Discards the explored values (but not the cached presses), so they
+        are explored again from the start.
+        """
+        start = self.level.get_start()
+        # Maps every value reached so far to the value it was reached from
+        # and the token of the button that was pressed to get there.
+        self.parents = {start: None}
+        # Values first reached after each amount of moves
+        self.layers = [[start]]
+
+    def get_level(self):
+        return self.level
+
+    def get_explored_moves(self):
+        return len(self.layers) - 1
+
+    def edit(self, moves=None, goal=None, buttons=None):
+        """
+        Replaces the level with an edited copy.
+        """
+        level = self.level
+        tokens = buttons if buttons is not None else \
+            [button.get_token() for button in level.get_buttons()]
+        edited_level = Level(level.get_index(),
+            moves if moves is not None else level.get_moves(),
+            goal if goal is not None else level.get_goal(),
+            level.get_start(), ', '.join(tokens), level.get_arithmetic())
+        if edited_level.is_stateful():
+            raise ValueError('levels with stateful buttons aren\'t supported.')
+        self.level = edited_level
+
+    def add_button(self, button):
+        """
+        Adds a button after the existing ones.
+
+        Keyword arguments:
+        button -- the string representing the operation of the button.
+        """
+        if not isinstance(button, str):
+            raise TypeError('\'button\' must be a string.')
+
+        tokens = [existing.get_token() for existing in self.level.get_buttons()]
+        self.edit(buttons=tokens + [button])
+        # The new button may reach values with fewer moves
+        self.reset()
+
+    def remove_button(self, button):
+        """
+        Removes a button (its first occurrence, if repeated).
+
+        Keyword arguments:
+        button -- the string representing the operation of the button.
+        """
+        tokens = [existing.get_token() for existing in self.level.get_buttons()]
+        if button not in tokens:
+            raise ValueError('the level has no button \'{0}\'.'.format(button))
+        if len(tokens) == 1:
+            raise ValueError('the level must keep at least one button.')
+
+        tokens.remove(button)
+        self.edit(buttons=tokens)
+        if button not in tokens:
+            self.edges.pop(button, None)
+        # Values reached through the button must be reached some other way
+        self.reset()
+
+    def set_moves(self, moves):
+        """
+        Changes the amount of moves of the level.
+        """
+        self.edit(moves=moves)
+
+    def set_goal(self, goal):
+        """
+        Changes the goal of the level.
+        """
+        self.edit(goal=goal)
+
+    def press(self, button, value):
+        """
+        Gets the value 'button' turns 'value' into, performing the operation
+        only the first time.
+        """
+        results = self.edges.get(button.get_token())
+        if results is None:
+            results = self.edges[button.get_token()] = {}
+
+        result = results.get(value, results)
+        if result is results:
+            result = results[value] = Solver.normalize_value(button(value))
+        return result
+
+    def explore(self, moves, goal=None):
+        """
+        Explores the values reached with up to 'moves' presses, continuing
+        from the moves already explored, and stopping early once 'goal' is
+        reached.
+        """
+        buttons = self.level.get_buttons()
+        parents = self.parents
+        layers = self.layers
+        normalize_value = Solver.normalize_value
+
+        # Cached presses of every button, along with its token
+        edges = []
+        for button in buttons:
+            results = self.edges.get(button.get_token())
+            if results is None:
+                results = self.edges[button.get_token()] = {}
+            edges.append((button, button.get_token(), results))
+
+        while len(layers) <= moves and layers[-1] and goal not in parents:
+            next_layer = []
+            for value in layers[-1]:
+                for button, token, results in edges:
+                    result = results.get(value, results)
+                    if result is results:
+                        result = results[value] = normalize_value(button(value))
+                    if result is not None and result not in parents:
+                        parents[result] = (value, token)
+                        next_layer.append(result)
+            layers.append(next_layer)
+
+    def get_path(self, value):
+        """
+        Gets the tokens of the buttons pressed to reach an explored value.
+        """
+        sequence = []
+        while self.parents[value] is not None:
+            value, token = self.parents[value]
+            sequence.append(token)
+        sequence.reverse()
+        return sequence
+
+    def solve(self):
+        """
+        Solves the level as it is now.
+
+        :return: the shortest sequence that reaches the goal with at most
+        'moves' presses, in the same format as Solver.solve, or None.
+        """
+        level = self.level
+        moves = level.get_moves()
+        goal = level.get_goal()
+
+        if goal != level.get_start():
+            self.explore(moves, goal)
+            if goal not in self.parents:
+                return None
+            sequence = self.get_path(goal)
+            return ' => '.join(sequence) if len(sequence) <= moves else None
+
+        # Reaching the start again takes at least one press, so look for
+        # the first explored value that returns to it.
+        self.explore(moves - 1)
+        for layer in self.layers[:moves]:
+            for value in layer:
+                for button in level.get_buttons():
+                    if self.press(button, value) == goal:
+                        return ' => '.join(self.get_path(value) + [button.get_token()])
+        return None
@@ -0,0 +1,125 @@
+from Operation import Operation, CompiledOperation
+
+import time
+
+class SolverStats:
+    """
+    Collects what a Solver does while solving a level: how many sequences
+    it tried, how many states it expanded, how many results it discarded
+    (and why) and how much time each type of operation took.
+    """
+
+    # Reasons for discarding a result
+    FRACTIONAL = 'fractional'
+    TOO_LONG = 'too_long'
+
+    def __init__(self, hook=None, interval=10000):
+        """
+        SolverStats constructor.
+
+        Keyword arguments:
+        hook -- (optional) function called with this instance every
+        'interval' sequences tried or states expanded, so the progress of
+        long solves can be sampled.
+        interval -- (optional) how often 'hook' is called.
+        """
+
+        # Type verifications
+        if hook is not None and not callable(hook):
+            raise TypeError('\'hook\' must be callable.')
+        if not isinstance(interval, int):
+            raise TypeError('\'interval\' must be an integer.')
+
+        # Value verifications
+        if interval < 1:
+            raise ValueError('\'interval\' must be a non-zero, positive integer.')
+
+        self.hook = hook
+        self.interval = interval
+        self.sequences_tried = 0
+        self.states_expanded = 0
+        self.prunes = {SolverStats.FRACTIONAL: 0, SolverStats.TOO_LONG: 0}
+        self.operation_calls = {}
+        self.operation_time = {}
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+        # Amount of events until the hook is called again
+        self.countdown = interval
+
+    def sequence_tried(self):
+        self.sequences_tried += 1
+        self.tick()
+
+    def state_expanded(self):
+        self.states_expanded += 1
+        self.tick()
+
+    def tick(self):
+        """
+        Calls the hook once every 'interval' events.
+        """
+        self.countdown -= 1
+        if self.countdown == 0:
+            self.countdown = self.interval
+            self.elapsed = time.perf_counter() - self.started
+            if self.hook is not None:
+                self.hook(self)
+
+    def record_prune(self, value):
+        """
+        Records a result discarded by Solver.normalize_value.
+
+        Keyword arguments:
+        value -- the discarded result.
+        """
+        if value != int(value):
+            self.prunes[SolverStats.FRACTIONAL] += 1
+        else:
+            self.prunes[SolverStats.TOO_LONG] += 1
+
+    def finish(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def time_buttons(self, buttons):
+        """
+        Wraps buttons so the time spent on each type of operation is
+        recorded.
+
+        :param buttons: (tuple) the CompiledOperation instances of a level.
+        :return: a tuple with the timed buttons, in the same order.
+        """
+        timed_buttons = []
+
+        for button in buttons:
+            operation_type = Operation.get_operation_type(button.get_token())
+            self.operation_calls.setdefault(operation_type, 0)
+            self.operation_time.setdefault(operation_type, 0.0)
+            timed_buttons.append(CompiledOperation(button.get_token(),
+                self.timed(operation_type, button.get_function()),
+                button.get_operation_type(), button.get_operands()))
+
+        return tuple(timed_buttons)
+
+    def timed(self, operation_type, function):
+        # Stateful buttons receive the whole state of the game
+        def press(*arguments):
+            started = time.perf_counter()
+            try:
+                return function(*arguments)
+            finally:
+                self.operation_time[operation_type] += time.perf_counter() - started
+                self.operation_calls[operation_type] += 1
+        return press
+
+    def as_dict(self):
+        """
+        Gets every statistic as a dictionary, such as for logging it.
+        """
+        return {
+            'sequences_tried': self.sequences_tried,
+            'states_expanded': self.states_expanded,
+            'prunes': dict(self.prunes),
+            'operation_calls': dict(self.operation_calls),
+            'operation_time': dict(self.operation_time),
+            'elapsed': self.elapsed
+        }
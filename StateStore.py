@@ -0,0 +1,179 @@
+from array import array
+import struct
+import sys
+
+class StateStore:
+    """
+    Records the values visited by a search over a bounded domain of
+    integers, along with the value each one was reached from and the index
+    of the button pressed, without storing Python objects per value: values
+    are kept by their offset from the minimum value, in a bitset (one bit
+    per value) and in blocks of parents allocated as they're first used.
+    """
+
+    # Amount of offsets per block of parents, as a power of two
+    BLOCK_BITS = 12
+    BLOCK_SIZE = 1 << BLOCK_BITS
+
+    # Largest encoded parent that fits in the parents array
+    MAXIMUM_PARENT = 2 ** 31 - 1
+
+    def __init__(self, minimum_value, maximum_value, branching=256):
+        """
+        StateStore constructor.
+
+        Keyword arguments:
+        minimum_value -- the smallest value of the domain.
+        maximum_value -- the largest value of the domain.
+        branching -- (optional) the amount of buttons, since the index of
+        the button pressed is stored with the parent of every value.
+        """
+
+        # Type verifications
+        if not isinstance(minimum_value, int):
+            raise TypeError('\'minimum_value\' must be an integer.')
+        if not isinstance(maximum_value, int):
+            raise TypeError('\'maximum_value\' must be an integer.')
+        if not isinstance(branching, int):
+            raise TypeError('\'branching\' must be an integer.')
+
+        # Value verifications
+        if maximum_value < minimum_value:
+            raise ValueError('\'maximum_value\' can\'t be smaller than \'minimum_value\'.')
+        if branching < 1:
+            raise ValueError('\'branching\' must be a non-zero, positive integer.')
+
+        self.minimum_value = minimum_value
+        self.size = maximum_value - minimum_value + 1
+        if self.size * branching > StateStore.MAXIMUM_PARENT:
+            raise ValueError('the domain is too large for \'branching\' buttons.')
+
+        self.branching = branching
+        self.visited = bytearray((self.size + 7) >> 3)
+        self.blocks = [None] * (((self.size - 1) >> StateStore.BLOCK_BITS) + 1)
+        self.count = 0
+
+    def __contains__(self, value):
+        offset = value - self.minimum_value
+        # Values outside of the domain are never visited
+        if not 0 <= offset < self.size:
+            return False
+        return bool(self.visited[offset >> 3] & (1 << (offset & 7)))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, value, parent=None, index=0):
+        """
+        Marks a value as visited, unless it already was.
+
+        Keyword arguments:
+        value -- the value visited. Must be within the domain.
+        parent -- (optional) the value it was reached from. Must be within
+        the domain.
+        index -- (optional) the index of the button pressed to reach it.
+
+        :return: a boolean informing if the value wasn't visited before.
+        """
+        offset = value - self.minimum_value
+        if not 0 <= offset < self.size:
+            raise ValueError('\'value\' must be within the domain ({0} is not).'.format(value))
+        if parent is not None and not 0 <= parent - self.minimum_value < self.size:
+            raise ValueError('\'parent\' must be within the domain ({0} is not).'.format(parent))
+        byte = offset >> 3
+        bit = 1 << (offset & 7)
+        visited = self.visited
+        if visited[byte] & bit:
+            return False
+        visited[byte] |= bit
+        self.count += 1
+
+        if parent is not None:
+            block = self.blocks[offset >> StateStore.BLOCK_BITS]
+            if block is None:
+                block = array('i', [-1]) * StateStore.BLOCK_SIZE
+                self.blocks[offset >> StateStore.BLOCK_BITS] = block
+            block[offset & (StateStore.BLOCK_SIZE - 1)] = \
+                (parent - self.minimum_value) * self.branching + index
+        return True
+
+    def get_parent(self, value):
+        """
+        Gets where a visited value was reached from.
+
+        :param value: (int) the value.
+        :return: a tuple with the parent value and the index of the button
+        pressed, or None if the value was added without a parent.
+        """
+        offset = value - self.minimum_value
+        block = self.blocks[offset >> StateStore.BLOCK_BITS]
+        if block is None:
+            return None
+        parent = block[offset & (StateStore.BLOCK_SIZE - 1)]
+        if parent < 0:
+            return None
+        parent_offset, index = divmod(parent, self.branching)
+        return parent_offset + self.minimum_value, index
+
+    def get_path(self, value):
+        """
+        Gets the indexes of the buttons pressed to reach a visited value,
+        following its parents back to a value added without one.
+
+        :param value: (int) the value.
+        :return: a list with the indexes, in the order they were pressed.
+        """
+        path = []
+        parent = self.get_parent(value)
+        while parent is not None:
+            value, index = parent
+            path.append(index)
+            parent = self.get_parent(value)
+        path.reverse()
+        return path
+
+    def get_memory(self):
+        """
+        Gets the amount of bytes used by the bitset and the blocks of
+        parents allocated so far.
+        """
+        blocks = sum(1 for block in self.blocks if block is not None)
+        return len(self.visited) + blocks * StateStore.BLOCK_SIZE * array('i').itemsize
+
+    def to_bytes(self):
+        """
+        Serializes the store: the bitset followed by the number and the
+        parents (little-endian) of every allocated block.
+        """
+        data = bytearray(self.visited)
+        for number, block in enumerate(self.blocks):
+            if block is None:
+                continue
+            if sys.byteorder == 'big':
+                block = array('i', block)
+                block.byteswap()
+            data += struct.pack('<I', number)
+            data += block.tobytes()
+        return bytes(data)
+
+    @staticmethod
+    def from_bytes(minimum_value, maximum_value, branching, data):
+        """
+        Rebuilds a store serialized by 'to_bytes', which must have been
+        built with the same arguments.
+        """
+        store = StateStore(minimum_value, maximum_value, branching)
+        position = len(store.visited)
+        store.visited[:] = data[:position]
+        store.count = bin(int.from_bytes(store.visited, 'little')).count('1')
+
+        block_length = StateStore.BLOCK_SIZE * array('i').itemsize
+        while position < len(data):
+            number, = struct.unpack_from('<I', data, position)
+            position += 4
+            block = array('i', data[position:position + block_length])
+            if sys.byteorder == 'big':
+                block.byteswap()
+            store.blocks[number] = block
+            position += block_length
+        return store
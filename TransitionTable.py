@@ -0,0 +1,243 @@
+from Level import Level
+from Solver import Solver
+
+from collections import OrderedDict
+
+# NumPy is an optional dependency, only needed by this engine.
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+class TransitionTable:
+    """
+    Precomputes, for every button of a level, the value the calculator
+    shows after pressing it over each value it can display, so levels are
+    solved with array lookups instead of performing the operations.
+    """
+
+    # Marks transitions that produce a value the calculator can't display
+    INVALID = -1
+
+    # Amount of values the calculator can display
+    SIZE = Solver.MAXIMUM_VALUE - Solver.MINIMUM_VALUE + 1
+
+    # Tables already built, shared by every level with the same button.
+    # Every table takes about 4.4 MB, so only the most recently used ones
+    # are kept.
+    cache = OrderedDict()
+    max_cached_tables = 8
+
+    # Largest operand the vectorized operations take, so their results
+    # never overflow 64-bit integers.
+    MAXIMUM_OPERAND = 2 ** 31
+
+    def __init__(self, level):
+        """
+        TransitionTable constructor.
+
+        Keyword arguments:
+        level -- instance of Level whose buttons are precomputed.
+        """
+
+        if numpy is None:
+            raise ImportError('TransitionTable requires NumPy to be installed.')
+
+        # Type verifications
+        if not isinstance(level, Level):
+            raise TypeError('\'level\' must be an instance of Level.')
+
+        # Value verifications
+        if level.is_stateful():
+            raise ValueError('levels with stateful buttons can\'t be precomputed.')
+
+        self.level = level
+        self.tables = tuple(TransitionTable.get_table(button, level.get_arithmetic())
+            for button in level.get_buttons())
+
+    @staticmethod
+    def get_table(button, arithmetic=False):
+        """
+        Gets the transitions of a single button, building them if they
+        aren't cached yet.
+
+        :param button: (CompiledOperation) the button to precompute.
+        :param arithmetic: (boolean) whether the button was compiled with
+        the arithmetic implementation of the digit operations.
+        :return: a NumPy array where the position of each value (its offset
+        from Solver.MINIMUM_VALUE) holds the offset of the value after
+        pressing the button, or TransitionTable.INVALID.
+        """
+        key = (button.get_token(), arithmetic)
+        cache = TransitionTable.cache
+        table = cache.get(key)
+
+        if table is None:
+            table = TransitionTable.build_vectorized(button)
+            if table is None:
+                table = TransitionTable.build(button)
+            cache[key] = table
+
+        # Discard the least recently used tables beyond the limit
+        cache.move_to_end(key)
+        while len(cache) > TransitionTable.max_cached_tables:
+            cache.popitem(last=False)
+
+        return table
+
+    @staticmethod
+    def build(button):
+        """
+        Builds the transitions of a button by pressing it over every value.
+        """
+        transitions = [TransitionTable.INVALID] * TransitionTable.SIZE
+        for offset in range(TransitionTable.SIZE):
+            result = Solver.normalize_value(button(offset + Solver.MINIMUM_VALUE))
+            if result is not None:
+                transitions[offset] = result - Solver.MINIMUM_VALUE
+        return numpy.array(transitions, dtype=numpy.int32)
+
+    @staticmethod
+    def build_vectorized(button):
+        """
+        Builds the transitions of a button with NumPy operations over every
+        value at once, giving the same table as 'build'.
+
+        :return: the table, or None if the operation of the button has no
+        vectorized implementation.
+        """
+        operation_type = button.get_operation_type()
+        if operation_type is None:
+            return None
+        operand = button.get_operands()
+        if isinstance(operand, int) and abs(operand) > TransitionTable.MAXIMUM_OPERAND:
+            return None
+
+        values = numpy.arange(Solver.MINIMUM_VALUE, Solver.MAXIMUM_VALUE + 1,
+            dtype=numpy.int64)
+        name = operation_type.name
+
+        if name == '+':
+            results = values + operand
+        elif name == '-':
+            results = values - operand
+        elif name == 'x':
+            results = values * operand
+        elif name == '/':
+            # Division by zero is left to 'build', which raises like the
+            # operation does.
+            if operand == 0:
+                return None
+            results = values / float(operand)
+        elif name == '+/-':
+            results = -values
+        elif name == '<<':
+            # Drop the last digit, keeping the sign (0 if only one is left)
+            results = numpy.sign(values) * (numpy.abs(values) // 10)
+        elif name == 'append':
+            if not operand.isdigit() or len(operand) > 6:
+                return None
+            shifted = numpy.abs(values) * 10 ** len(operand) + int(operand)
+            results = numpy.where(values < 0, -shifted, shifted)
+        else:
+            return None
+
+        # Same rules as Solver.normalize_value
+        valid = (results >= Solver.MINIMUM_VALUE) & (results <= Solver.MAXIMUM_VALUE)
+        if results.dtype.kind == 'f':
+            valid &= results == numpy.floor(results)
+        offsets = results.astype(numpy.int64) - Solver.MINIMUM_VALUE
+        return numpy.where(valid, offsets, TransitionTable.INVALID).astype(numpy.int32)
+
+    @staticmethod
+    def clear_cache():
+        """
+        Releases the memory of every table built so far.
+        """
+        TransitionTable.cache.clear()
+
+    def solve(self):
+        """
+        Solves the level by propagating the set of reachable values through
+        the tables, one move at a time. Like Solver.BREADTH_FIRST, returns
+        the shortest sequence that uses at most 'moves' presses.
+        """
+        level = self.level
+        start = Solver.normalize_value(level.get_start())
+        goal = Solver.normalize_value(level.get_goal())
+
+        # Goals outside of the tables can never be reached
+        if goal is None:
+            return None
+        goal = goal - Solver.MINIMUM_VALUE
+
+        # For every value reached so far, the value it was reached from and
+        # the index of the button that was pressed to get there.
+        visited = numpy.zeros(TransitionTable.SIZE, dtype=bool)
+        parents = numpy.full(TransitionTable.SIZE, TransitionTable.INVALID, dtype=numpy.int32)
+        pressed = numpy.zeros(TransitionTable.SIZE, dtype=numpy.int16)
+        moves = level.get_moves()
+
+        if start is not None:
+            start = start - Solver.MINIMUM_VALUE
+            visited[start] = True
+            frontier = numpy.array([start], dtype=numpy.int32)
+        else:
+            # A start outside of the tables is expanded by pressing the
+            # buttons directly. The values it reaches have no parent.
+            start = TransitionTable.INVALID
+            frontier = []
+            for index, button in enumerate(level.get_buttons()):
+                result = Solver.normalize_value(button(level.get_start()))
+                if result is None:
+                    continue
+                result -= Solver.MINIMUM_VALUE
+                if result == goal:
+                    return button.get_token()
+                if not visited[result]:
+                    visited[result] = True
+                    pressed[result] = index
+                    frontier.append(result)
+            frontier = numpy.array(frontier, dtype=numpy.int32)
+            moves -= 1
+
+        for _ in range(moves):
+            next_frontier = []
+
+            for index, table in enumerate(self.tables):
+                successors = table[frontier]
+                valid = successors != TransitionTable.INVALID
+                sources = frontier[valid]
+                successors = successors[valid]
+
+                # If the goal was reached, rebuild the path that led to it
+                hits = numpy.flatnonzero(successors == goal)
+                if len(hits):
+                    sequence = [index]
+                    value = int(sources[hits[0]])
+                    while value != start:
+                        sequence.append(int(pressed[value]))
+                        value = int(parents[value])
+                        # Reached from a start outside of the tables
+                        if value == TransitionTable.INVALID:
+                            break
+                    sequence.reverse()
+                    return ' => '.join(level.get_button_at(digit).get_token()
+                        for digit in sequence)
+
+                # Only keep the first occurrence of values reached for the
+                # first time.
+                new = ~visited[successors]
+                successors, first = numpy.unique(successors[new], return_index=True)
+                sources = sources[new][first]
+
+                visited[successors] = True
+                parents[successors] = sources
+                pressed[successors] = index
+                next_frontier.append(successors.astype(numpy.int32))
+
+            frontier = numpy.concatenate(next_frontier)
+            if not len(frontier):
+                break
+
+        return None
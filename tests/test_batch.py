@@ -0,0 +1,29 @@
+import Batch
+
+import io
+import unittest
+
+class TestBatch(unittest.TestCase):
+    """
+    Checks malformed levels only fail their own result.
+    """
+
+    def test_malformed_lines(self):
+        source = io.StringIO(
+            '{"index": 1, "moves": 2, "goal": 4, "start": 0, "buttons": "+2"}\n'
+            '{malformed\n'
+            'null\n'
+            '\n'
+            '{"index": 4, "moves": 3, "goal": 6, "start": 0, "buttons": ["+2"]}\n')
+        results = list(Batch.solve_levels(Batch.read_levels(source), workers=1))
+
+        self.assertEqual(len(results), 4)
+        solutions = {result['index']: result['solution'] for result in results
+            if 'error' not in result}
+        self.assertEqual(solutions, {1: '+2 => +2', 4: '+2 => +2 => +2'})
+        errors = [result['error'] for result in results if 'error' in result]
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(any(error.startswith('JSONDecodeError') for error in errors))
+
+if __name__ == '__main__':
+    unittest.main()
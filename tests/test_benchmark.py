@@ -0,0 +1,37 @@
+import Benchmark
+
+import unittest
+
+class TestCompare(unittest.TestCase):
+    """
+    Checks which differences with the baseline are taken as regressions.
+    """
+
+    @staticmethod
+    def report(seconds, states=100, peak_memory=1000):
+        return {'results': [{'level': 1, 'mode': 'breadth_first', 'seconds': seconds,
+            'states': states, 'peak_memory': peak_memory}]}
+
+    def metrics(self, report, baseline):
+        return [regression['metric'] for regression in Benchmark.compare(report, baseline)]
+
+    def test_noise(self):
+        # Short times may grow by a large ratio without being regressions
+        self.assertEqual(self.metrics(self.report(0.109), self.report(0.082)), [])
+        self.assertEqual(self.metrics(self.report(0.0034), self.report(0.0021)), [])
+
+    def test_regressions(self):
+        self.assertEqual(self.metrics(self.report(0.9), self.report(0.3)), ['seconds'])
+        self.assertEqual(self.metrics(self.report(0.001, states=130), self.report(0.001)),
+            ['states'])
+        self.assertEqual(self.metrics(self.report(0.001, peak_memory=1300),
+            self.report(0.001)), ['peak_memory'])
+
+    def test_threshold(self):
+        with self.assertRaises(ValueError):
+            Benchmark.compare(self.report(1), self.report(1), threshold=0.9)
+        with self.assertRaises(SystemExit):
+            Benchmark.main(['--threshold', '0.5'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+from GameState import GameState
+from Level import Level
+from Operation import Operation
+from Solver import Solver
+
+import unittest
+
+class TestStatefulButtons(unittest.TestCase):
+    """
+    Checks levels whose buttons change the other buttons or store values.
+    """
+
+    def test_division_by_zero_operand(self):
+        # '[+]1' turns '/-1' into '/0', which can't be pressed
+        self.assertEqual(Operation.set_operand('/-1', -2), '/-2')
+        self.assertIsNone(Operation.set_operand('/-1', 0))
+
+        level = Level(1, 2, 999, 5, '[+]1, /-1')
+        state = GameState.from_level(level).press(level, 0)
+        self.assertIsNone(state.press(level, 1))
+
+        solver = Solver()
+        for mode in (Solver.BRUTE_FORCE, Solver.BREADTH_FIRST):
+            with self.subTest(mode=mode):
+                self.assertIsNone(solver.solve(level, mode))
+
+        level = Level(1, 3, -5, 5, '[+]1, /-1')
+        self.assertEqual(solver.solve(level, Solver.BREADTH_FIRST), '/-1')
+        self.assertEqual(solver.solve(level, Solver.BRUTE_FORCE), '/-1 => [+]1 => [+]1')
+
+if __name__ == '__main__':
+    unittest.main()
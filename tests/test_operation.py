@@ -0,0 +1,109 @@
+from Operation import Operation
+
+import os
+import unittest
+
+class TestArithmeticOperations(unittest.TestCase):
+    """
+    Compares the string and the integer arithmetic implementations of the
+    digit operations over the values the calculator can display. Every
+    value is only compared with CALCULATOR_FULL_RANGE=1 in the environment
+    (it takes about a minute); otherwise a sample is.
+    """
+
+    MINIMUM_VALUE = -99999
+    MAXIMUM_VALUE = 999999
+
+    TOKENS = (
+        '<<',
+        '0', '1', '7', '00', '12', '305',
+        '1=>2', '0=>9', '9=>0', '12=>3', '3=>12', '00=>1', '10=>01', '123=>45',
+        'Reverse',
+        'SUM',
+        '<Shift',
+        'Shift>',
+        'Mirror',
+        'x^0', 'x^1', 'x^2'
+    )
+
+    # Distance between the values sampled outside of the small values and
+    # the changes in the amount of digits, which are always compared.
+    SAMPLE_STEP = 13
+
+    # math.pow, used by the string implementation of 'x^', only represents
+    # every integer up to 2**53 exactly.
+    FLOAT_PRECISION = 2 ** 53
+
+    @classmethod
+    def get_values(cls):
+        """
+        Gets the values the implementations are compared on, in order.
+        """
+        if os.environ.get('CALCULATOR_FULL_RANGE') == '1':
+            return range(cls.MINIMUM_VALUE, cls.MAXIMUM_VALUE + 1)
+
+        values = set(range(-1000, 1001))
+        values.update(range(cls.MINIMUM_VALUE, cls.MAXIMUM_VALUE + 1, cls.SAMPLE_STEP))
+        for exponent in range(7):
+            for value in (10 ** exponent - 1, 10 ** exponent, 10 ** exponent + 1):
+                values.update((value, -value))
+        return sorted(value for value in values
+            if cls.MINIMUM_VALUE <= value <= cls.MAXIMUM_VALUE)
+
+    @staticmethod
+    def call(function, value):
+        """
+        Calls an operation, taking the exception it raises (if any) as its
+        result, since both implementations must fail for the same values.
+        """
+        try:
+            return function(value)
+        except (ValueError, OverflowError) as error:
+            return type(error)
+
+    def compare(self, token, values):
+        """
+        Asserts both implementations of an operation agree on every value.
+        """
+        string_function = Operation.get_operation(token)
+        arithmetic_function = Operation.get_operation(token, arithmetic=True)
+        self.assertIsNotNone(string_function)
+        self.assertIsNotNone(arithmetic_function)
+
+        call = self.call
+        mismatches = []
+        for value in values:
+            expected = call(string_function, value)
+            actual = call(arithmetic_function, value)
+            if expected != actual:
+                mismatches.append((value, expected, actual))
+                if len(mismatches) >= 10:
+                    break
+        self.assertEqual(mismatches, [], 'operation \'{0}\''.format(token))
+
+    def test_digit_operations(self):
+        values = self.get_values()
+        for token in self.TOKENS:
+            with self.subTest(token=token):
+                self.compare(token, values)
+
+    def test_cube(self):
+        values = self.get_values()
+        precise = [value for value in values
+            if abs(value) ** 3 <= self.FLOAT_PRECISION]
+        imprecise = [value for value in values
+            if abs(value) ** 3 > self.FLOAT_PRECISION]
+
+        self.compare('x^3', precise)
+
+        # Beyond 2**53 only the arithmetic version is exact, and the string
+        # version is off for some values. None of them can be displayed.
+        arithmetic_function = Operation.get_operation('x^3', arithmetic=True)
+        string_function = Operation.get_operation('x^3')
+        for value in imprecise:
+            self.assertEqual(arithmetic_function(value), value ** 3)
+        self.assertTrue(any(string_function(value) != value ** 3 for value in imprecise))
+        self.assertTrue(all(abs(value ** 3) > self.MAXIMUM_VALUE for value in imprecise))
+
+if __name__ == '__main__':
+    unittest.main()
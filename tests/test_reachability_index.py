@@ -0,0 +1,28 @@
+from Level import Level
+from ReachabilityIndex import ReachabilityIndex
+from Solver import Solver
+
+import os
+import tempfile
+import unittest
+
+class TestReachabilityIndex(unittest.TestCase):
+    """
+    Checks the index gives the same solutions as Solver.BREADTH_FIRST.
+    """
+
+    def test_goal_is_start(self):
+        index = ReachabilityIndex(1, '+1, -1', 3)
+        level = Level(1, 2, 1, 1, '+1, -1')
+        self.assertEqual(Solver().solve(level, Solver.BREADTH_FIRST), '+1 => -1')
+        self.assertEqual(index.solve(level), '+1 => -1')
+        self.assertIsNone(index.solve(Level(1, 1, 1, 1, '+1, -1')))
+
+        # The return to the start is kept in the file
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'index.bin')
+            index.save(path)
+            self.assertEqual(ReachabilityIndex.load(path).solve(level), '+1 => -1')
+
+if __name__ == '__main__':
+    unittest.main()
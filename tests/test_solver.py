@@ -0,0 +1,298 @@
+from Checkpoint import Checkpoint
+from Level import Level
+from SequencePruner import SequencePruner
+from Solver import Solver
+
+import itertools
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+class Interrupted(Exception):
+    """
+    Stops a resumable solve, as if the process was killed.
+    """
+
+def solve_interrupted(level, mode, saves=2):
+    """
+    Solves a level with Solver.solve_resumable, interrupting every run
+    after 'saves' checkpoints and resuming it from the file until it
+    finishes. A resumed run may save what it loaded first, so 'saves' must
+    be at least 2 for the runs to make progress.
+
+    :return: a tuple with the solution and the amount of interruptions.
+    """
+    save = Checkpoint.save
+    count = [0]
+
+    def interrupting_save(checkpoint, state):
+        save(checkpoint, state)
+        count[0] += 1
+        if count[0] == saves:
+            raise Interrupted()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'checkpoint.json')
+        interruptions = 0
+        with mock.patch.object(Checkpoint, 'save', interrupting_save):
+            try:
+                return Solver().solve_resumable(level, path, mode, interval=0), interruptions
+            except Interrupted:
+                interruptions += 1
+
+            while True:
+                count[0] = 0
+                try:
+                    return Solver().resume(path, interval=0), interruptions
+                except Interrupted:
+                    interruptions += 1
+
+# Small levels (moves, goal, start and buttons) every mode is compared on
+LEVELS = (
+    (3, 8, 0, '+2, +3'),
+    (3, 9, 3, 'x4, +4, -2'),
+    (3, 5, 15, '<<, 5, +/-'),
+    (3, 8, 100, '/2, 1=>2, /5'),
+    (5, 35, 1, 'x^2, Reverse, +3, -1'),
+    (5, 91, 12, 'SUM, <Shift, 4, x2'),
+    (4, 6886, 25, 'Shift>, Mirror, -9, <<'),
+    (5, -567, 7, '+/-, x3, 2=>5, /2'),
+    (5, 14, 2, '+3, -2, x2, +/-'),
+    (5, 21, 5, 'x3, /3, +0, -4'),
+    (4, 12, 12, '+1, -1, x1'),
+    (5, 321, 123, 'Reverse, <Shift, Shift>, +1'),
+    (4, 999999, 1, 'x10, 9, <<'),
+    (4, 4, 1, 'x2, /2, +/-, x-1'),
+    (5, 100, 3, '+4, x5, -7, /2'),
+    (5, 77, 0, '+7, +/-, x0, 7'),
+    (4, -40, 10, '-5, x2, +/-, Reverse'),
+    (5, 1234, 0, '1, 2, 3, 4, <<')
+)
+
+def build_levels():
+    return [Level(index, moves, goal, start, buttons)
+        for index, (moves, goal, start, buttons) in enumerate(LEVELS, 1)]
+
+def press(level, sequence):
+    """
+    Presses a sequence of button indexes, following the rules of
+    Solver.sequence_works.
+
+    :return: the value reached, or None if the calculator can't display
+    any of the values along the way.
+    """
+    value = level.get_start()
+    for index in sequence:
+        value = Solver.normalize_value(level.get_button_at(index)(int(value)))
+        if value is None:
+            return None
+    return value
+
+def reference(level):
+    """
+    Solves a level trying every sequence, shortest first.
+
+    :return: a tuple with the first sequence of exactly 'moves' presses
+    that reaches the goal (as Solver.BRUTE_FORCE returns it) and the first
+    of the shortest ones, in the order of the counter, or None.
+    """
+    indexes = range(len(level.get_buttons()))
+    exact = None
+    shortest = None
+    for length in range(1, level.get_moves() + 1):
+        for sequence in itertools.product(indexes, repeat=length):
+            if press(level, sequence) == level.get_goal():
+                if shortest is None:
+                    shortest = sequence
+                if length == level.get_moves():
+                    exact = sequence
+                    break
+
+    def to_buttons(sequence):
+        if sequence is None:
+            return None
+        return ' => '.join(level.get_button_at(index).get_token() for index in sequence)
+
+    return to_buttons(exact), to_buttons(shortest)
+
+def to_indexes(level, solution):
+    """
+    Maps a solution returned by Solver.solve back to button indexes.
+    """
+    tokens = [button.get_token() for button in level.get_buttons()]
+    return [tokens.index(token) for token in solution.split(' => ')]
+
+class TestModes(unittest.TestCase):
+    """
+    Compares every mode with the solutions found by trying every sequence.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        cls.levels = [(level, reference(level)) for level in build_levels()]
+
+    def assert_exact(self, mode):
+        for level, (exact, _) in self.levels:
+            with self.subTest(level=level.get_index()):
+                self.assertEqual(Solver().solve(level, mode), exact)
+
+    def assert_shortest(self, mode):
+        for level, (_, shortest) in self.levels:
+            with self.subTest(level=level.get_index()):
+                solution = Solver().solve(level, mode)
+                if shortest is None:
+                    self.assertIsNone(solution)
+                    continue
+                # Any of the shortest sequences is a valid solution
+                self.assertIsNotNone(solution)
+                sequence = to_indexes(level, solution)
+                self.assertEqual(len(sequence), len(shortest.split(' => ')))
+                self.assertEqual(press(level, sequence), level.get_goal())
+
+    def test_brute_force(self):
+        self.assert_exact(Solver.BRUTE_FORCE)
+
+    def test_depth_first(self):
+        self.assert_exact(Solver.DEPTH_FIRST)
+
+    def test_parallel(self):
+        self.assert_exact(Solver.PARALLEL)
+
+    def test_breadth_first(self):
+        self.assert_shortest(Solver.BREADTH_FIRST)
+
+    def test_meet_in_the_middle(self):
+        self.assert_shortest(Solver.MEET_IN_THE_MIDDLE)
+
+    def test_iterative_deepening(self):
+        # The transposition table must not skip any value that still
+        # reaches the goal, so the first of the shortest sequences is found.
+        for level, (_, shortest) in self.levels:
+            with self.subTest(level=level.get_index()):
+                self.assertEqual(Solver().solve(level, Solver.ITERATIVE_DEEPENING), shortest)
+
+    def test_best_first(self):
+        self.assert_shortest(Solver.BEST_FIRST)
+
+    def test_transition_table(self):
+        try:
+            import numpy
+        except ImportError:
+            self.skipTest('TransitionTable requires NumPy.')
+        self.assert_shortest(Solver.TRANSITION_TABLE)
+
+class TestPruning(unittest.TestCase):
+    """
+    Checks the sequences skipped by Solver.PRUNED reach values that other
+    sequences reach with the same or fewer presses.
+    """
+
+    def test_pruned(self):
+        for level in build_levels():
+            with self.subTest(level=level.get_index()):
+                _, shortest = reference(level)
+                solution = Solver().solve(level, Solver.PRUNED)
+                # The first sequence found, not necessarily the shortest
+                if shortest is None:
+                    self.assertIsNone(solution)
+                else:
+                    self.assertIsNotNone(solution)
+                    sequence = to_indexes(level, solution)
+                    self.assertLessEqual(len(sequence), level.get_moves())
+                    self.assertEqual(press(level, sequence), level.get_goal())
+
+    def test_rules(self):
+        values = range(-1000, 1001)
+        for level in build_levels():
+            pruner = SequencePruner(level)
+            buttons = level.get_buttons()
+            for previous, index in itertools.product(range(len(buttons)), repeat=2):
+                with self.subTest(level=level.get_index(), previous=previous, index=index):
+                    for value in values:
+                        once = Solver.normalize_value(buttons[previous](value))
+                        if once is None:
+                            continue
+                        twice = Solver.normalize_value(buttons[index](once))
+
+                        # Redundant presses leave the value as it was before
+                        # the press, or undo the previous one.
+                        if pruner.is_redundant(previous, index):
+                            if index in pruner.no_ops:
+                                self.assertEqual(twice, once)
+                            else:
+                                self.assertEqual(twice, value)
+
+                        # Commuting buttons reach the same value in the
+                        # canonical order, when it's valid.
+                        if pruner.is_out_of_order(previous, index) and twice is not None:
+                            swapped = Solver.normalize_value(buttons[index](value))
+                            if swapped is not None:
+                                self.assertEqual(
+                                    Solver.normalize_value(buttons[previous](swapped)), twice)
+
+class TestResume(unittest.TestCase):
+    """
+    Checks interrupted solves resume to the same solution as uninterrupted
+    ones.
+    """
+
+    def test_resume(self):
+        levels = build_levels()[4:12]
+        for mode in (Solver.BRUTE_FORCE, Solver.DEPTH_FIRST, Solver.BREADTH_FIRST):
+            interruptions = 0
+            for level in levels:
+                expected = Solver().solve(level, mode)
+                for saves in (2, 25):
+                    with self.subTest(mode=mode, level=level.get_index(), saves=saves):
+                        solution, count = solve_interrupted(level, mode, saves)
+                        self.assertEqual(solution, expected)
+                        interruptions += count
+            # The solves were actually interrupted
+            self.assertGreater(interruptions, 0)
+
+    def test_other_level(self):
+        levels = build_levels()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'checkpoint.json')
+            with mock.patch.object(Checkpoint, 'remove'):
+                Solver().solve_resumable(levels[4], path, Solver.DEPTH_FIRST, interval=0)
+            # The file holds the progress of another level
+            with self.assertRaises(ValueError):
+                Solver().solve_resumable(levels[5], path, Solver.DEPTH_FIRST)
+
+class TestStartOutOfRange(unittest.TestCase):
+    """
+    Checks levels starting at a value the calculator can't display, which
+    can't be stored by the breadth-first search.
+    """
+
+    LEVELS = (
+        (Level(1, 2, 95000, -150000, '+1100000, <<'), '+1100000 => <<'),
+        (Level(1, 1, 500000, 5000000, '<<'), '<<'),
+        (Level(1, 3, 7, -200000, '+200001, +3, x2'), '+200001 => +3 => +3')
+    )
+
+    def test_modes(self):
+        for level, solution in self.LEVELS:
+            for mode in Solver.MODES:
+                with self.subTest(goal=level.get_goal(), mode=mode):
+                    self.assertEqual(Solver().solve(level, mode), solution)
+
+    def test_resumable_breadth_first(self):
+        levels = [level for level, _ in self.LEVELS]
+        levels.append(Level(1, 7, 22, -150000, '+150001, +1, x2'))
+        for level in levels:
+            with self.subTest(goal=level.get_goal()):
+                expected = Solver().solve(level, Solver.BREADTH_FIRST)
+                self.assertEqual(solve_interrupted(level, Solver.BREADTH_FIRST)[0],
+                    expected)
+
+        # The search was actually interrupted after expanding the start
+        solution, interruptions = solve_interrupted(levels[-1], Solver.BREADTH_FIRST)
+        self.assertEqual(solution, Solver().solve(levels[-1], Solver.BREADTH_FIRST))
+        self.assertIsNotNone(solution)
+        self.assertGreater(interruptions, 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+from Level import Level
+from Operation import Operation
+from TransitionTable import TransitionTable, numpy
+
+import unittest
+
+@unittest.skipIf(numpy is None, 'TransitionTable requires NumPy.')
+class TestTransitionTable(unittest.TestCase):
+    """
+    Checks the vectorized tables and the bound on the cached ones.
+    """
+
+    def tearDown(self):
+        TransitionTable.clear_cache()
+
+    def test_vectorized_tables(self):
+        for token in ('+7', '--3', 'x-4', '/3', '+/-', '<<', '05'):
+            with self.subTest(token=token):
+                button = Operation.compile_operation(token)
+                table = TransitionTable.build_vectorized(button)
+                self.assertIsNotNone(table)
+                self.assertTrue(numpy.array_equal(table, TransitionTable.build(button)))
+
+        # Operations without a vectorized implementation are built by 'build'
+        self.assertIsNone(TransitionTable.build_vectorized(
+            Operation.compile_operation('Reverse')))
+
+    def test_start_out_of_range(self):
+        # The start can't be in the tables, but the values it reaches are
+        level = Level(1, 2, 95000, -150000, '+1100000, <<')
+        self.assertEqual(TransitionTable(level).solve(), '+1100000 => <<')
+        level = Level(1, 1, 500000, 5000000, '<<')
+        self.assertEqual(TransitionTable(level).solve(), '<<')
+        level = Level(1, 3, 7, -200000, '+200001, +3, x2')
+        self.assertEqual(TransitionTable(level).solve(), '+200001 => +3 => +3')
+
+    def test_cache_size(self):
+        for operand in range(TransitionTable.max_cached_tables + 2):
+            TransitionTable.get_table(Operation.compile_operation('+{0}'.format(operand)))
+        self.assertEqual(len(TransitionTable.cache), TransitionTable.max_cached_tables)
+        self.assertNotIn(('+0', False), TransitionTable.cache)
+        self.assertIn(('+{0}'.format(operand), False), TransitionTable.cache)
+
+if __name__ == '__main__':
+    unittest.main()